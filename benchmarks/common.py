@@ -0,0 +1,30 @@
+# Scene building shared by benchmarks.
+from src.node_editor.core.components import Scene, Node, Edge, EdgeType
+from src.node_editor.presentation.components import NodeGraphicsScene
+from src.node_editor.presentation.edge_layer import EdgeLayer
+
+
+# scene attached to its graphics scene, optionally virtualized and with edges drawn by edge layer
+def createScene(virtualized=False, edge_layer=False):
+    scene = Scene()
+    grScene = NodeGraphicsScene(scene)
+    grScene.setVirtualized(virtualized)
+    scene.attach(grScene)
+    if edge_layer:
+        grScene.setEdgeLayer(EdgeLayer())
+    return scene
+
+
+# nodes laid out row by row, to be called in scene batch
+def addNodeGrid(scene, count, columns, inputs=(0,), outputs=(0,), title="Node %d",
+                spacing=(240, 300), origin=(0, 0)):
+    nodes = [Node(scene, title % i, inputs=list(inputs), outputs=list(outputs)) for i in range(count)]
+    for i, node in enumerate(nodes):
+        node.setPos(origin[0] + (i % columns) * spacing[0], origin[1] + (i // columns) * spacing[1])
+    return nodes
+
+
+# each node connected to the next one
+def chainNodes(scene, nodes, output=0, input=0):
+    for previous, node in zip(nodes, nodes[1:]):
+        Edge(scene, previous.outputs[output], node.inputs[input], EdgeType.Bezier)
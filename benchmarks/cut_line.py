@@ -0,0 +1,49 @@
+# Reports handler time per mouse move event while drawing long cut line,
+# at the start of gesture and after many points were added to it.
+# Run from repository root: py -m benchmarks.cut_line [count]
+import math
+import sys
+import time
+
+from PyQt5.QtCore import Qt, QEvent, QPoint, QPointF
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from src.node_editor.core.components import Scene
+from src.node_editor.node_view import NodeGraphicsView
+from src.node_editor.presentation.components import NodeGraphicsScene
+
+
+def main(count, window=200):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = Scene()
+    scene.attach(NodeGraphicsScene(scene))
+    view = NodeGraphicsView(scene)
+    view.resize(1200, 800)
+    view.show()
+    app.processEvents()
+
+    viewport = view.viewport()
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.ControlModifier, QPoint(20, 20))
+    times = []
+    for i in range(count):
+        # cursor sweeping back and forth over viewport
+        pos = QPointF(600 + 500 * math.sin(i / 50), 400 + 350 * math.sin(i / 77))
+        begin = time.perf_counter()
+        QApplication.sendEvent(viewport, QMouseEvent(QEvent.MouseMove, pos, Qt.NoButton, Qt.LeftButton, Qt.ControlModifier))
+        app.processEvents()
+        times.append(time.perf_counter() - begin)
+    points = len(view.cutLine.line_points)
+    QTest.mouseRelease(viewport, Qt.LeftButton, Qt.ControlModifier, QPoint(600, 400))
+
+    window = min(window, count)
+    print("mouse events: %d, cut line points: %d" % (count, points))
+    print("first %d events: %6.2f ms per event" % (window, sum(times[:window]) / window * 1e3))
+    print("last %d events:  %6.2f ms per event" % (window, sum(times[-window:]) / window * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
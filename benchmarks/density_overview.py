@@ -0,0 +1,66 @@
+# Reports frame time of far zoomed-out view of large virtualized scene,
+# with nodes drawn at low detail and aggregated by density layer,
+# and cost of keeping density layer in sync with moved nodes.
+# Run from repository root: py -m benchmarks.density_overview [count]
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from benchmarks.common import createScene, addNodeGrid
+from src.node_editor.node_view import NodeGraphicsView
+from src.node_editor.presentation.components import DetailLevel
+from src.node_editor.presentation.density_layer import DensityLayer
+
+
+def build(count):
+    scene = createScene(virtualized=True)
+    # grid centered on scene origin
+    columns = int(count ** 0.5)
+    with scene.batch():
+        addNodeGrid(scene, count, columns, spacing=(220, 280), origin=(-columns / 2 * 220, -columns / 2 * 280))
+    return scene
+
+
+def pan(view, frames):
+    horizontal = view.horizontalScrollBar()
+    start = time.perf_counter()
+    for i in range(frames):
+        horizontal.setValue(horizontal.value() + (5 if i % 2 else -5))
+        view.viewport().repaint()
+    return (time.perf_counter() - start) / frames
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = build(count)
+    view = NodeGraphicsView(scene)
+    view.resize(1600, 1000)
+    view.show()
+    scale = DetailLevel.AGGREGATED_SCALE * 0.8
+    view.scale(scale, scale)
+    app.processEvents()
+
+    grScene = scene.grScene
+    print("nodes: %d, view scale: %.3f" % (count, scale))
+    grScene.setDetailLevel(DetailLevel.AGGREGATED)
+    view._updateVisibleRect()
+    print("low detail  frame: %7.2f ms   (%d node widgets)" % (pan(view, 20) * 1e3, len(grScene.virtualizer)))
+
+    layer = DensityLayer()
+    start = time.perf_counter()
+    layer.rebuild(scene.geometry)
+    print("density layer build: %7.2f ms" % ((time.perf_counter() - start) * 1e3))
+    grScene.setDensityLayer(layer)
+    print("aggregated  frame: %7.2f ms   (%d node widgets)" % (pan(view, 20) * 1e3, len(grScene.virtualizer)))
+
+    nodes = list(scene.nodes)[:1000]
+    start = time.perf_counter()
+    scene.translateNodes(nodes, 300, 300)
+    print("move 1000 nodes: %7.2f ms" % ((time.perf_counter() - start) * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,84 @@
+# Reports edge updates and handler time per mouse move event, while dragging node
+# with many connections by mouse events arriving faster than frames are painted,
+# with edges updated on every event and once per frame.
+# Run from repository root: py -m benchmarks.drag_updates [count]
+import sys
+import time
+
+from PyQt5.QtCore import Qt, QEvent, QPoint, QPointF
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+import src.node_editor.core.components as components
+from benchmarks.common import createScene, addNodeGrid
+from src.node_editor.core.components import Node, Edge, EdgeType
+from src.node_editor.node_view import NodeGraphicsView
+
+
+def build(count):
+    scene = createScene()
+    with scene.batch():
+        hub = Node(scene, "Hub", outputs=[0])
+        for node in addNodeGrid(scene, count, 10, outputs=[], origin=(600, -4000)):
+            Edge(scene, hub.outputs[0], node.inputs[0], EdgeType.Bezier)
+    return scene, hub
+
+
+def drag(app, view, hub, events, event_interval):
+    updates = [0]
+    update_positions = components.Edge.updatePositions
+
+    def counted(edge):
+        updates[0] += 1
+        update_positions(edge)
+
+    components.Edge.updatePositions = counted
+    viewport = view.viewport()
+    start = view.mapFromScene(hub.grNode.scenePos()) + QPoint(60, 8)
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, start)
+    # events due since last frame are delivered together before next frame is processed,
+    # like queued input of busy event loop
+    busy = 0.0
+    sent = 0
+    frames = 0
+    begin = time.perf_counter()
+    while sent < events:
+        # waits for next event, when previous frame was faster than events arrive
+        time.sleep(max(0.0, begin + (sent + 1) * event_interval - time.perf_counter()))
+        due = min(events, int((time.perf_counter() - begin) / event_interval))
+        frame_begin = time.perf_counter()
+        for i in range(sent + 1, due + 1):
+            pos = QPointF(start + QPoint(i % 40, i % 20))
+            QApplication.sendEvent(viewport, QMouseEvent(QEvent.MouseMove, pos, Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+        app.processEvents()
+        busy += time.perf_counter() - frame_begin
+        sent = due
+        frames += 1
+    QTest.mouseRelease(viewport, Qt.LeftButton, Qt.NoModifier, start)
+    components.Edge.updatePositions = update_positions
+    return updates[0] / events, busy / events, events / frames
+
+
+def main(count, events=120, event_interval=0.002):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene, hub = build(count)
+    view = NodeGraphicsView(scene)
+    view.resize(1200, 800)
+    view.show()
+    view.centerOn(300, 100)
+    app.processEvents()
+
+    print("connections: %d, mouse events: %d every %.1f ms" % (count, events, event_interval * 1e3))
+    # zero interval updates edges on every event
+    for interval in (0, 16):
+        scene.grScene.frame_scheduler.setInterval(interval)
+        updates, busy, batch = drag(app, view, hub, events, event_interval)
+        print("frame interval %2d ms: %7.1f edge updates, %6.2f ms per event, %4.1f events per frame"
+              % (interval, updates, busy * 1e3, batch))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,67 @@
+# Reports repaint time of dense edge layer drawn edge by edge and bundled,
+# and how long background bundling of all edges takes.
+# Run from repository root: py -m benchmarks.edge_bundling [count]
+import random
+import sys
+import time
+
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from benchmarks.common import createScene, addNodeGrid
+from src.node_editor.core.components import Edge, EdgeType
+from src.node_editor.node_view import NodeGraphicsView
+
+
+# two columns of nodes connected mostly to their neighbours on the other side
+def build(count, rows=20):
+    random.seed(1)
+    scene = createScene(edge_layer=True)
+    with scene.batch():
+        left = addNodeGrid(scene, 3 * rows, 3, inputs=[], outputs=[0, 1, 2], title="Source %d", spacing=(220, 280))
+        right = addNodeGrid(scene, 3 * rows, 3, inputs=[0, 1, 2], outputs=[], title="Target %d",
+                            spacing=(220, 280), origin=(3000, 0))
+        for _ in range(count):
+            i = random.randrange(len(left))
+            j = min(len(right) - 1, max(0, i + random.randint(-4, 4)))
+            Edge(scene, random.choice(left[i].outputs), random.choice(right[j].inputs), EdgeType.Bezier)
+    return scene
+
+
+def measure(view, frames):
+    view.viewport().repaint()
+    start = time.perf_counter()
+    for _ in range(frames):
+        view.viewport().repaint()
+    return (time.perf_counter() - start) / frames
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = build(count)
+    view = NodeGraphicsView(scene)
+    view.resize(1600, 1000)
+    view.show()
+    view.fitInView(scene.grScene.itemsBoundingRect())
+    app.processEvents()
+    layer = scene.grScene.edge_layer
+
+    print("edges: %d" % count)
+    print("per edge  frame: %8.2f ms" % (measure(view, 10) * 1e3))
+    # repaints would be counted in otherwise
+    view.setUpdatesEnabled(False)
+    start = time.perf_counter()
+    layer.setBundling(True)
+    while layer.bundler.busy:
+        app.processEvents()
+        QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    view.setUpdatesEnabled(True)
+    print("bundling:        %8.2f ms   (%d bundles)" % ((time.perf_counter() - start) * 1e3, len(layer.bundler)))
+    print("bundled   frame: %8.2f ms" % (measure(view, 10) * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,68 @@
+# Reports time of cutting edges by long freehand cut line crossing large graph,
+# with edges drawn as widgets and by edge layer.
+# Run from repository root: py -m benchmarks.edge_cut [count]
+import math
+import random
+import sys
+import time
+
+from PyQt5.QtCore import QPointF
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from src.core.polyline import simplifyPolyline
+from benchmarks.common import createScene, addNodeGrid, chainNodes
+from src.node_editor.core.components import Edge, EdgeType
+from src.node_editor.node_view import NodeGraphicsView
+
+COLUMNS = 50
+
+
+def build(count, layer):
+    random.seed(1)
+    scene = createScene(virtualized=True, edge_layer=layer)
+    with scene.batch():
+        nodes = addNodeGrid(scene, count, COLUMNS, inputs=[0, 1])
+        chainNodes(scene, nodes)
+        for i in range(1, count):
+            source = nodes[random.randrange(max(0, i - 200), i)]
+            Edge(scene, source.outputs[0], nodes[i].inputs[1], EdgeType.Bezier)
+    return scene
+
+
+def cutLine(count, points):
+    # wavy line drawn by mouse across all rows, with slight jitter of hand
+    height = (count // COLUMNS) * 300
+    return [
+        QPointF(6000 + 4000 * math.sin(k / 40) + random.uniform(-2, 2), k * height / points)
+        for k in range(points)
+    ]
+
+
+def main(count, points=600):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print("nodes: %d, cut line points: %d" % (count, points))
+    for layer in (False, True):
+        scene = build(count, layer)
+        view = NodeGraphicsView(scene)
+        view.resize(1200, 800)
+        view.show()
+        app.processEvents()
+
+        line = cutLine(count, points)
+        simplified = simplifyPolyline([(p.x(), p.y()) for p in line], 1.0 / view.transform().m11())
+        edges = len(scene.edges)
+        for point in line:
+            view.cutLine.addPoint(point)
+        begin = time.perf_counter()
+        view._cutIntersectingEdges()
+        elapsed = time.perf_counter() - begin
+        print("%-7s: %d of %d edges cut in %7.1f ms, %d segments tested" % (
+            "layer" if layer else "widgets", edges - len(scene.edges), edges, elapsed * 1e3, len(simplified) - 1))
+        view.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,53 @@
+# Reports Python heap bytes per node, socket and edge of the scene model.
+# Run from repository root: py -m benchmarks.memory_model [count]
+import sys
+import tracemalloc
+
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from src.node_editor.core.components import Scene, Node, Edge, EdgeType
+
+
+def instance_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, items
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = Scene()
+
+    node_bytes, plain_nodes = measure(lambda: [Node(scene, "Node") for _ in range(count)])
+    socket_bytes, socket_nodes = measure(lambda: [Node(scene, "Node", inputs=[0], outputs=[0]) for _ in range(count)])
+    socket_bytes -= node_bytes
+    edge_bytes, edges = measure(lambda: [
+        Edge(scene, socket_nodes[i].outputs[0], socket_nodes[i + 1].inputs[0], EdgeType.Bezier)
+        for i in range(count - 1)
+    ])
+
+    print("nodes: %d" % count)
+    print("bytes per node:   %8.1f" % (node_bytes / count))
+    print("bytes per socket: %8.1f" % (socket_bytes / (2 * count)))
+    print("bytes per edge:   %8.1f" % (edge_bytes / (count - 1)))
+    # model instances alone, without presentation items
+    node = socket_nodes[0]
+    print("node instance:    %8d" % (instance_size(node) + instance_size(node.content)))
+    print("socket instance:  %8d" % instance_size(node.inputs[0]))
+    print("edge instance:    %8d" % instance_size(edges[0]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
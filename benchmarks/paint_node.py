@@ -0,0 +1,45 @@
+# Reports per-node cost of NodeWidget.paint with cold and warm path cache.
+# Run from repository root: py -m benchmarks.paint_node [count]
+import sys
+import time
+
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+import src.core.logger as logger
+from src.node_editor.core.components import Scene, Node
+from src.node_editor.presentation.components import NodeGraphicsScene, NodeWidget
+
+
+def measure(grNode, count, cold):
+    image = QImage(256, 256, QImage.Format.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    option = QStyleOptionGraphicsItem()
+    start = time.perf_counter()
+    for _ in range(count):
+        if cold:
+            # same as building and simplifying paths on every paint
+            NodeWidget.path_cache.clear()
+        grNode.paint(painter, option, None)
+    elapsed = time.perf_counter() - start
+    painter.end()
+    return elapsed / count
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = Scene()
+    scene.attach(NodeGraphicsScene(scene))
+    node = Node(scene, "Node", inputs=[0, 0], outputs=[0])
+
+    cold = measure(node.grNode, count, cold=True)
+    warm = measure(node.grNode, count, cold=False)
+    print("paints: %d" % count)
+    print("uncached paint: %8.2f us/node" % (cold * 1e6))
+    print("cached paint:   %8.2f us/node" % (warm * 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,58 @@
+# Reports viewport repaint time of a static scene and while dragging a node,
+# with item caches disabled and with default cache policy.
+# Run from repository root: py -m benchmarks.render_cache [count]
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from benchmarks.common import createScene, addNodeGrid, chainNodes
+from src.node_editor.node_view import NodeGraphicsView
+
+
+def build(count):
+    scene = createScene()
+    with scene.batch():
+        chainNodes(scene, addNodeGrid(scene, count, 8, inputs=[0, 1], outputs=[2]))
+    return scene
+
+
+def measure(view, frames, step=None):
+    app = QApplication.instance()
+    view.viewport().repaint()
+    start = time.perf_counter()
+    for i in range(frames):
+        if step is not None:
+            step(i)
+            app.processEvents()
+        else:
+            view.viewport().repaint()
+    return (time.perf_counter() - start) / frames
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = build(count)
+    view = NodeGraphicsView(scene)
+    view.resize(1600, 1000)
+    view.show()
+    view.centerOn(900, 600)
+    app.processEvents()
+    node = next(iter(scene.nodes))
+
+    def drag(i):
+        node.grNode.setPos(node.grNode.pos().x() + (1 if i % 2 else -1), node.grNode.pos().y())
+        node.updateEdges()
+
+    print("nodes: %d" % count)
+    for name, enabled in (("no cache", False), ("policy", True)):
+        scene.grScene.cache_policy.setEnabled(enabled)
+        static = measure(view, 50)
+        dragging = measure(view, 200, drag)
+        print("%-9s static repaint: %7.2f ms   drag frame: %7.2f ms" % (name, static * 1e3, dragging * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,71 @@
+# Reports time of listing selected nodes and edges by scanning selected scene items
+# and from scene selection, and time of bulk selection changes.
+# Run from repository root: py -m benchmarks.selection [count]
+import sys
+import time
+
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainterPath
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from benchmarks.common import createScene, addNodeGrid, chainNodes
+from src.node_editor.presentation.components import NodeWidget, EdgeWidget
+
+COLUMNS = 200
+
+
+def build(count):
+    scene = createScene()
+    with scene.batch():
+        chainNodes(scene, addNodeGrid(scene, count, COLUMNS))
+    return scene
+
+
+def measure(function, repeat=10):
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - begin) / repeat
+
+
+def main(count, selected=0.25):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    # widgets of all nodes are created, which takes much longer than measured operations
+    begin = time.perf_counter()
+    scene = build(count)
+    grScene = scene.grScene
+    print("nodes: %d, build: %.1f s" % (count, time.perf_counter() - begin))
+
+    # rubber band over first rows of nodes
+    rows = max(1, int(count * selected) // COLUMNS)
+    area = QPainterPath()
+    area.addRect(QRectF(-100, -100, COLUMNS * 240, rows * 300))
+    begin = time.perf_counter()
+    grScene.setSelectionArea(area)
+    print("selection area:         %8.2f ms" % ((time.perf_counter() - begin) * 1e3))
+
+    def scan():
+        items = grScene.selectedItems()
+        return [item.node for item in items if isinstance(item, NodeWidget)], \
+               [item.edge for item in items if isinstance(item, EdgeWidget)]
+
+    def listed():
+        return scene.getSelectedNodes(), scene.getSelectedEdges()
+
+    nodes, edges = listed()
+    print("selected: %d nodes, %d edges" % (len(nodes), len(edges)))
+    print("scan of selected items: %8.2f ms" % (measure(scan) * 1e3))
+    print("scene selection:        %8.2f ms" % (measure(listed) * 1e3))
+
+    begin = time.perf_counter()
+    scene.selection.clear()
+    print("bulk deselect:          %8.2f ms" % ((time.perf_counter() - begin) * 1e3))
+    begin = time.perf_counter()
+    scene.selection.select(nodes, edges)
+    print("bulk select:            %8.2f ms" % ((time.perf_counter() - begin) * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,49 @@
+# Reports viewport frame time while panning a dense scene,
+# painted regularly and composited from tile cache.
+# Run from repository root: py -m benchmarks.tile_pan [count]
+import sys
+import time
+
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from benchmarks.render_cache import build
+from src.node_editor.node_view import NodeGraphicsView
+from src.node_editor.presentation.tile_cache import TileCache
+
+
+def pan(view, frames, step=7):
+    app = QApplication.instance()
+    horizontal, vertical = view.horizontalScrollBar(), view.verticalScrollBar()
+    view._panning = True
+    start = time.perf_counter()
+    for i in range(frames):
+        delta = step if (i // 60) % 2 == 0 else -step
+        horizontal.setValue(horizontal.value() + delta)
+        vertical.setValue(vertical.value() + delta // 2)
+        view.viewport().repaint()
+        app.processEvents()
+    view._panning = False
+    return (time.perf_counter() - start) / frames
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = build(count)
+    view = NodeGraphicsView(scene)
+    view.resize(1600, 1000)
+    view.show()
+    view.centerOn(900, 600)
+    app.processEvents()
+
+    print("nodes: %d" % count)
+    print("regular  pan frame: %7.2f ms" % (pan(view, 240) * 1e3))
+    tile_cache = TileCache(view)
+    view.setTileCache(tile_cache)
+    print("tiles    pan frame: %7.2f ms   (cold, %d tiles)" % (pan(view, 240) * 1e3, len(tile_cache)))
+    print("tiles    pan frame: %7.2f ms   (warm, %d tiles)" % (pan(view, 240) * 1e3, len(tile_cache)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
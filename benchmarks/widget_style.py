@@ -0,0 +1,64 @@
+# Reports construction time and Python heap bytes per SocketWidget and EdgeWidget,
+# compared with allocating own colors, pens and brushes per widget.
+# Run from repository root: py -m benchmarks.widget_style [count]
+import sys
+import time
+import tracemalloc
+
+from PyQt5.QtGui import QColor, QPen, QBrush
+from PyQt5.QtWidgets import QApplication
+
+import src.core.logger as logger
+from src.node_editor.core.components import Scene, Node, Edge, EdgeType
+from src.node_editor.presentation.components import SocketWidget, EdgeWidget
+
+
+def own_socket_style(socket_type):
+    colors = [QColor("#FFFF7700"), QColor("#FF52e220"), QColor("#FF0056a6"),
+              QColor("#FFa86db1"), QColor("#FFb54747"), QColor("#FFdbe220")]
+    pen = QPen(QColor("#FF000000"))
+    pen.setWidthF(2)
+    return colors, pen, QBrush(colors[socket_type])
+
+
+def own_edge_style():
+    pens = [QPen(QColor("#001000")), QPen(QColor("#00ff00")), QPen(QColor("#ff0000"))]
+    for pen in pens:
+        pen.setWidthF(2.0)
+    return pens
+
+
+def measure(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    items = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed / count, (after - before) / count, items
+
+
+def report(name, shared, own):
+    print("%-8s shared: %7.2f us %6.0f B   own style: %7.2f us %6.0f B" % (
+        name, shared[0] * 1e6, shared[1], (shared[0] + own[0]) * 1e6, shared[1] + own[1]
+    ))
+
+
+def main(count):
+    logger.DEBUG = False
+    app = QApplication.instance() or QApplication(sys.argv)
+    scene = Scene()
+    node = Node(scene, "Node", inputs=[0], outputs=[0])
+    socket = node.outputs[0]
+    edge = Edge(scene, node.outputs[0], node.inputs[0], EdgeType.Bezier)
+
+    # own style is measured alone and added on top of widget built with shared style
+    report("socket", measure(lambda i: SocketWidget(socket, i % 6), count)[:2],
+           measure(lambda i: own_socket_style(i % 6), count)[:2])
+    report("edge", measure(lambda i: EdgeWidget(edge), count)[:2],
+           measure(lambda i: own_edge_style(), count)[:2])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -1,7 +1,31 @@
+class IdAllocator:
+
+    def __init__(self, start=1):
+        self._next = start
+
+    def next(self):
+        item_id = self._next
+        self._next += 1
+        return item_id
+
+    # marks restored id as taken, so it's never handed out again
+    def reserve(self, item_id):
+        if item_id >= self._next:
+            self._next = item_id + 1
+        return item_id
+
+
+# used by items created without owning allocator
+_default_ids = IdAllocator()
+
+
 class Serializable:
+    __slots__ = ('id',)
 
-    def __init__(self):
-        self.id = id(self)
+    # restored item keeps its stored id instead of allocating new one
+    def __init__(self, ids=None, item_id=None):
+        ids = ids if ids is not None else _default_ids
+        self.id = ids.next() if item_id is None else ids.reserve(item_id)
 
     def serialize(self):
         raise NotImplemented()
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# helpers for polylines given as sequences of (x, y) tuples or arrays of points
+
+
+# Ramer-Douglas-Peucker simplification, drops points closer than tolerance to kept segments
+def simplifyPolyline(points, tolerance):
+    count = len(points)
+    if count < 3:
+        return list(points)
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    limit = tolerance * tolerance
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        ax, ay = points[first]
+        bx, by = points[last]
+        dx, dy = bx - ax, by - ay
+        length = dx * dx + dy * dy
+        index, distance = -1, limit
+        for i in range(first + 1, last):
+            px, py = points[i]
+            t = ((px - ax) * dx + (py - ay) * dy) / length if length else 0.0
+            t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            ex, ey = ax + t * dx - px, ay + t * dy - py
+            d = ex * ex + ey * ey
+            if d > distance:
+                index, distance = i, d
+        if index >= 0:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _cross(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _within(ax, ay, bx, by, cx, cy):
+    # c is collinear with a, b
+    return (np.minimum(ax, bx) <= cx) & (cx <= np.maximum(ax, bx)) & (np.minimum(ay, by) <= cy) & (cy <= np.maximum(ay, by))
+
+
+# tests segments ab against segments cd element-wise, coordinates are scalars or arrays of same shape
+def segmentsIntersect(ax, ay, bx, by, cx, cy, dx, dy):
+    d1 = np.sign(_cross(cx, cy, dx, dy, ax, ay))
+    d2 = np.sign(_cross(cx, cy, dx, dy, bx, by))
+    d3 = np.sign(_cross(ax, ay, bx, by, cx, cy))
+    d4 = np.sign(_cross(ax, ay, bx, by, dx, dy))
+    return ((d1 * d2 < 0) & (d3 * d4 < 0)) | (
+        ((d1 == 0) & _within(cx, cy, dx, dy, ax, ay)) |
+        ((d2 == 0) & _within(cx, cy, dx, dy, bx, by)) |
+        ((d3 == 0) & _within(ax, ay, bx, by, cx, cy)) |
+        ((d4 == 0) & _within(ax, ay, bx, by, dx, dy))
+    )
+
+
+# tests pairs of polyline and segment in single pass, polylines are arrays of points of shape (n, 2),
+# owners tell polyline of each pair and segments hold (ax, ay, bx, by) of each pair,
+# returns array telling which pairs intersect
+def polylinesIntersectSegments(polylines, owners, segments):
+    owners = np.asarray(owners, dtype=np.intp)
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    hits = np.zeros(len(owners), dtype=bool)
+    lengths = np.array([len(points) for points in polylines], dtype=np.intp)
+    # pairs of polylines without segments can't intersect
+    pairs = np.flatnonzero(lengths[owners] > 1) if len(owners) else owners
+    if not len(pairs):
+        return hits
+    points = np.concatenate([np.asarray(points, dtype=np.float64).reshape(-1, 2) for points in polylines])
+    starts = np.cumsum(lengths) - lengths
+    # points of each pair's polyline are tested one after another against line ab,
+    # given by its normal (nx, ny) and offset c, which are gathered per point instead of segment ends
+    counts = lengths[owners[pairs]]
+    pair = np.repeat(pairs, counts)
+    index = np.arange(counts.sum()) + np.repeat(starts[owners[pairs]] - (np.cumsum(counts) - counts), counts)
+    ax, ay, bx, by = segments.T
+    nx, ny = ay - by, bx - ax
+    c = nx * ax + ny * ay
+    side = np.sign(points[:, 0][index] * nx[pair] + points[:, 1][index] * ny[pair] - c[pair])
+    # only polyline segments with ends on different sides of line ab, or on it, can cross segment ab
+    crossing = np.flatnonzero((side[:-1] * side[1:] <= 0) & (pair[:-1] == pair[1:]))
+    first, second, pair = index[crossing], index[crossing + 1], pair[crossing]
+    found = segmentsIntersect(
+        points[first, 0], points[first, 1], points[second, 0], points[second, 1],
+        ax[pair], ay[pair], bx[pair], by[pair]
+    )
+    hits[pair[found]] = True
+    return hits
+
+
+def polylineIntersectsSegment(points, ax, ay, bx, by):
+    return bool(polylinesIntersectSegments([points], [0], [(ax, ay, bx, by)])[0])
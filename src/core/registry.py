@@ -0,0 +1,34 @@
+# insertion-ordered collection of serializable items keyed by their id,
+# add, remove, lookup and membership checks are O(1)
+class Registry:
+
+    def __init__(self):
+        self._items = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        # iterate over a snapshot, so items can be removed while iterating
+        return iter(tuple(self._items.values()))
+
+    def __contains__(self, item):
+        return self._items.get(item.id) is item
+
+    def get(self, item_id, default=None):
+        return self._items.get(item_id, default)
+
+    def add(self, item):
+        self._items[item.id] = item
+
+    def remove(self, item):
+        if self._items.get(item.id) is not item:
+            return False
+        del self._items[item.id]
+        return True
+
+    def clear(self):
+        self._items.clear()
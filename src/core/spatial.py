@@ -0,0 +1,90 @@
+import math
+
+
+# uniform grid hashing items by their bounding boxes,
+# insert, remove and rect queries touch only cells covered by given boxes,
+# items covering more than max_cells are kept aside and returned by every query
+class SpatialGrid:
+
+    def __init__(self, cell_size=256, max_cells=64):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self._cells = {}
+        self._ranges = {}
+        self._large = set()
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, item):
+        return item in self._ranges
+
+    def _range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (
+            math.floor(left / size),
+            math.floor(top / size),
+            math.floor(right / size),
+            math.floor(bottom / size),
+        )
+
+    def insert(self, item, left, top, right, bottom):
+        cells = self._range(left, top, right, bottom)
+        previous = self._ranges.get(item)
+        if previous == cells:
+            return
+        if previous is not None:
+            self._discard(item, previous)
+        self._ranges[item] = cells
+        i0, j0, i1, j1 = cells
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > self.max_cells:
+            self._large.add(item)
+            return
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells.get((i, j))
+                if cell is None:
+                    cell = self._cells[(i, j)] = set()
+                cell.add(item)
+
+    def remove(self, item):
+        cells = self._ranges.pop(item, None)
+        if cells is None:
+            return False
+        self._discard(item, cells)
+        return True
+
+    def _discard(self, item, cells):
+        if item in self._large:
+            self._large.discard(item)
+            return
+        i0, j0, i1, j1 = cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells[(i, j)]
+                cell.discard(item)
+                if not cell:
+                    del self._cells[(i, j)]
+
+    # returns items, whose cells overlap given rect, callers test exact geometry
+    def query(self, left, top, right, bottom):
+        i0, j0, i1, j1 = self._range(left, top, right, bottom)
+        cells = self._cells
+        found = set(self._large)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > len(cells):
+            # rect covers more cells than are occupied
+            for (i, j), cell in cells.items():
+                if i0 <= i <= i1 and j0 <= j <= j1:
+                    found.update(cell)
+            return found
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i, j))
+                if cell is not None:
+                    found.update(cell)
+        return found
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+        self._large.clear()
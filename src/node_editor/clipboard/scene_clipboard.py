@@ -1,8 +1,6 @@
 import json
 from collections import OrderedDict
 
-from src.node_editor.presentation.components import *
-
 
 class SceneClipboard:
 
@@ -12,18 +10,14 @@ class SceneClipboard:
 
     def _save(self):
         # store and sort selected items
-        saved_nodes, edges, socket_map = [], [], {}
-        for selected in self._scene.grScene.selectedItems():
-            if isinstance(selected, NodeWidget):
-                node = selected.node
-                saved_nodes.append(node.serialize())
-                for socket in (node.inputs + node.outputs):
-                    socket_map[socket.id] = socket
-            elif isinstance(selected, EdgeWidget):
-                edges.append(selected.edge)
+        saved_nodes, socket_map = [], {}
+        for node in self._scene.getSelectedNodes():
+            saved_nodes.append(node.serialize())
+            for socket in (node.inputs + node.outputs):
+                socket_map[socket.id] = socket
         # add only edge connected to both selected sockets
         saved_edges = []
-        for edge in edges:
+        for edge in self._scene.getSelectedEdges():
             if edge.start_socket.id in socket_map and edge.end_socket.id in socket_map:
                 saved_edges.append(edge.serialize())
 
@@ -57,38 +51,28 @@ class SceneClipboard:
 
         hashmap = {}
 
-        # eval scene pos using mouse pos
-        view = self._scene.grScene.views()[0]
-        mouse_pos = view.lastMousePos
-        # eval selected items bounds and center
-        min_x, min_y, max_x, max_y = 0, 0, 0, 0
-        for node_data in data['nodes']:
-            x, y = node_data['pos_x'], node_data['pos_y']
-            if x < min_x:
-                min_x = x
-            if x > max_x:
-                max_x = x
-            if y < min_y:
-                min_y = y
-            if y > max_y:
-                max_y = y
-        bbox_center_x = (min_x + max_x) / 2
-        bbox_center_y = (min_y + max_y) / 2
-        # eval offset new items
-        offset_x = mouse_pos.x() - bbox_center_x
-        offset_y = mouse_pos.y() - bbox_center_y
-        # create nodes
-        for node_data in data['nodes']:
-            from src.node_editor.core.components import Node
-            node = Node(self._scene)
-            node.deserialize(node_data, hashmap, restore=False)
-            pos = node.pos
-            node.setPos(pos.x() + offset_x, pos.y() + offset_y)
-        # create edges
-        for edge_data in data['edges']:
-            from src.node_editor.core.components import Edge
-            edge = Edge(self._scene)
-            edge.deserialize(edge_data, hashmap, restore=False)
+        with self._scene.batch():
+            # create nodes
+            nodes = []
+            for node_data in data['nodes']:
+                from src.node_editor.core.components import Node
+                node = Node(self._scene)
+                node.deserialize(node_data, hashmap, restore=False)
+                nodes.append(node)
+            # move pasted nodes bounds center under mouse
+            bounds = self._scene.getNodesBounds(nodes)
+            if bounds is not None and self._scene.grScene is not None:
+                # eval scene pos using mouse pos
+                mouse_pos = self._scene.grScene.views()[0].lastMousePos
+                left, top, right, bottom = bounds
+                offset_x = mouse_pos.x() - (left + right) / 2
+                offset_y = mouse_pos.y() - (top + bottom) / 2
+                self._scene.translateNodes(nodes, offset_x, offset_y)
+            # create edges
+            for edge_data in data['edges']:
+                from src.node_editor.core.components import Edge
+                edge = Edge(self._scene)
+                edge.deserialize(edge_data, hashmap, restore=False)
         # store history
         self._scene.history.store("Pasting items from clipboard", modified=True)
         return True
@@ -1,22 +1,29 @@
 import json
+import weakref
 from collections import OrderedDict
+from contextlib import contextmanager
 
 from src.core.logger import log
+from src.core.registry import Registry
 from src.node_editor.clipboard.scene_clipboard import SceneClipboard
+from src.node_editor.core.geometry import GeometryStore
+from src.node_editor.core.selection import Selection
 from src.node_editor.history.scene_history import SceneHistory
-from serialization.serializable import Serializable
-
-from src.node_editor.presentation.components import *
+from src.node_editor.core.types import *
+from serialization.serializable import Serializable, IdAllocator
 
 # ---------------- Scene --------------- #
 
 
 class Scene(Serializable):
     def __init__(self):
-        super().__init__()
-        self.nodes = []
-        self.edges = []
+        self.ids = IdAllocator()
+        super().__init__(self.ids)
+        self.nodes = Registry()
+        self.edges = Registry()
         self.width, self.height = 64000, 64000
+        self.geometry = GeometryStore()
+        self.selection = Selection(self)
         self.mode = SceneMode.NONE
         self.history = SceneHistory(self)
         self.clipboard = SceneClipboard(self)
@@ -24,8 +31,16 @@ class Scene(Serializable):
         self._modified = False
         self._modified_listeners = []
 
+        # side effects deferred until outermost batch commits
+        self._batch_depth = 0
+        self._batch_nodes = []
+        self._batch_edges = []
+        self._batch_moved = {}
+        self._batch_dirty_edges = {}
+        self._batch_modified = False
+
+        # optional presentation, observing scene items
         self.grScene = None
-        self.init()
 
     @property
     def modified(self):
@@ -35,11 +50,17 @@ class Scene(Serializable):
     def modified(self, is_modified):
         if not self._modified and is_modified:
             self._modified = is_modified
-            for listener in self._modified_listeners:
-                listener()
+            if self._batch_depth > 0:
+                self._batch_modified = True
+            else:
+                self._notifyModified()
 
         self._modified = is_modified
 
+    def _notifyModified(self):
+        for listener in self._modified_listeners:
+            listener()
+
     def observe(self, listener):
         self._modified_listeners.append(listener)
 
@@ -49,27 +70,138 @@ class Scene(Serializable):
     def removeObservers(self):
         self._modified_listeners.clear()
 
-    def init(self):
-        self.grScene = NodeGraphicsScene(self)
+    def attach(self, grScene):
+        self.grScene = grScene
         self.grScene.setGrScene(self.width, self.height)
+        self.grScene.beginBulkUpdate(len(self.nodes) + len(self.edges))
+        try:
+            self.grScene.onNodesAdded(list(self.nodes))
+            self.grScene.onEdgesAdded(list(self.edges))
+        finally:
+            self.grScene.endBulkUpdate()
+
+    # groups scene changes, presentation updates, edge geometry and modified listeners
+    # are applied once, when outermost batch commits
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._commitBatch()
+
+    @property
+    def batching(self):
+        return self._batch_depth > 0
+
+    def _commitBatch(self):
+        nodes = [node for node in self._batch_nodes if node in self.nodes]
+        edges = [edge for edge in self._batch_edges if edge in self.edges]
+        added = set(nodes)
+        moved = [node for node in self._batch_moved if node in self.nodes and node not in added]
+        dirty_edges = [edge for edge in self._batch_dirty_edges if edge in self.edges]
+        modified = self._batch_modified
+        self._batch_nodes, self._batch_edges = [], []
+        self._batch_moved, self._batch_dirty_edges = {}, {}
+        self._batch_modified = False
+
+        if self.grScene is not None:
+            self.grScene.beginBulkUpdate(len(moved) + len(nodes) + len(edges) + len(dirty_edges))
+            try:
+                self.grScene.onNodesMoved(moved)
+                self.grScene.onNodesAdded(nodes)
+                self.grScene.onEdgesAdded(edges)
+                for edge in dirty_edges:
+                    edge.updatePositions()
+            finally:
+                self.grScene.endBulkUpdate()
+
+        if modified and self._modified:
+            self._notifyModified()
+
+    # returns True, if edge geometry update is postponed until batch commits
+    def deferEdgeUpdate(self, edge):
+        if self._batch_depth == 0:
+            return False
+        self._batch_dirty_edges[edge] = None
+        return True
 
     def addNode(self, node):
-        self.nodes.append(node)
+        self.addNodes((node,))
+
+    def addNodes(self, nodes):
+        for node in nodes:
+            self.nodes.add(node)
+        if self._batch_depth > 0:
+            self._batch_nodes.extend(nodes)
+        elif self.grScene is not None:
+            self.grScene.onNodesAdded(nodes)
 
     def addEdge(self, edge):
-        self.edges.append(edge)
+        self.addEdges((edge,))
+
+    def addEdges(self, edges):
+        for edge in edges:
+            self.edges.add(edge)
+        if self._batch_depth > 0:
+            self._batch_edges.extend(edges)
+        elif self.grScene is not None:
+            self.grScene.onEdgesAdded(edges)
 
     def removeNode(self, node):
-        if node in self.nodes:
-            self.nodes.remove(node)
-        else:
+        if not self.nodes.remove(node):
             log(self, "removeNode: can't remove node=%s" % node)
+            return False
+        self.selection.setNodeSelected(node, False)
+        if self.grScene is not None:
+            self.grScene.onNodeRemoved(node)
+        return True
 
     def removeEdge(self, edge):
-        if edge in self.edges:
-            self.edges.remove(edge)
-        else:
+        if not self.edges.remove(edge):
             log(self, "removeEdge: can't remove edge=%s" % edge)
+            return
+        self.selection.setEdgeSelected(edge, False)
+        if self.grScene is not None:
+            self.grScene.onEdgeRemoved(edge)
+
+    def getSelectedNodes(self):
+        return self.selection.getNodes()
+
+    def getSelectedEdges(self):
+        return self.selection.getEdges()
+
+    def translateNodes(self, nodes, dx, dy):
+        self.geometry.translate([node.slot for node in nodes], dx, dy)
+        for node in nodes:
+            node.invalidateAnchors()
+        self.onNodesMoved(nodes)
+        for node in nodes:
+            node.updateEdges()
+
+    def onNodesMoved(self, nodes):
+        if self._batch_depth > 0:
+            self._batch_moved.update(dict.fromkeys(nodes))
+        elif self.grScene is not None:
+            self.grScene.onNodesMoved(nodes)
+
+    def getNodesBounds(self, nodes=None):
+        slots = None if nodes is None else [node.slot for node in nodes]
+        return self.geometry.bounds(slots)
+
+    def getNodesIn(self, left, top, right, bottom):
+        return self.geometry.getItems(self.geometry.query(left, top, right, bottom))
+
+    def getNodesAt(self, x, y):
+        return self.geometry.getItems(self.geometry.hit(x, y))
+
+    def getNode(self, node_id):
+        return self.nodes.get(node_id)
+
+    def getEdge(self, edge_id):
+        return self.edges.get(edge_id)
 
     def saveToFile(self, filename):
         with open(filename, "w") as file:
@@ -103,45 +235,68 @@ class Scene(Serializable):
         self.clear()
         hashmap = {}
         if restore:
-            self.id = data['id']
+            # restored ids must not collide with ids of items created meanwhile
+            self.ids.reserve(self._getMaxId(data))
+            self.id = self.ids.reserve(data['id'])
         # scene info
         self.width = data['width']
         self.height = data['height']
-        # create nodes
+        with self.batch():
+            # create nodes
+            for node_data in data['nodes']:
+                node = Node(self, item_id=node_data['id'], content_id=node_data['content']['id']) if restore else Node(self)
+                node.deserialize(node_data, hashmap, restore)
+            # create edges
+            for edge_data in data['edges']:
+                edge = Edge(self, item_id=edge_data['id']) if restore else Edge(self)
+                edge.deserialize(edge_data, hashmap, restore)
+
+    @staticmethod
+    def _getMaxId(data):
+        max_id = data['id']
         for node_data in data['nodes']:
-            Node(self).deserialize(node_data, hashmap, restore)
-        # create edges
+            max_id = max(max_id, node_data['id'], node_data['content']['id'])
+            for socket_data in node_data['inputs'] + node_data['outputs']:
+                max_id = max(max_id, socket_data['id'])
         for edge_data in data['edges']:
-            Edge(self).deserialize(edge_data, hashmap, restore)
+            max_id = max(max_id, edge_data['id'])
+        return max_id
 
     def clear(self):
         self.modified = False
-        while len(self.nodes) > 0:
-            self.nodes[0].remove()
+        for node in self.nodes:
+            node.remove()
 
 
 # ---------------- Node --------------- #
 
 
 class Node(Serializable):
+    __slots__ = ('_scene', '_title', 'slot', 'content', 'grNode', 'inputs', 'outputs', '_anchors', '__weakref__')
 
-    def __init__(self, scene, title="Undefined", inputs=None, outputs=None):
-        super().__init__()
+    socket_spacing = 22
+    edge_size = 10
+    title_height = 24
+    padding = 4.0
 
-        self.scene = scene
+    def __init__(self, scene, title="Undefined", inputs=None, outputs=None, item_id=None, content_id=None):
+        super().__init__(scene.ids, item_id)
+
+        self._scene = weakref.ref(scene)
         self._title = title
+        # setup geometry
+        self.slot = self.scene.geometry.allocate(self, 0, 0, 180, 240)
+        # scene positions of sockets, created on first use and dropped on move or resize
+        self._anchors = None
         # setup content
-        self.content = NodeContent(self)
-        # setup presentation
-        self.grNode = NodeWidget(self)
-        # associate to scene
-        self.scene.addNode(self)
-        self.scene.grScene.addItem(self.grNode)
+        self.content = NodeContent(self, content_id)
         # setup sockets
-        self.socket_spacing = 22
+        self.grNode = None
         self.inputs = []
         self.outputs = []
         self._init_sockets(inputs, outputs)
+        # associate to scene, presentation is created by scene observer
+        self.scene.addNode(self)
 
     def _init_sockets(self, inputs, outputs):
         # create input sockets
@@ -161,6 +316,10 @@ class Node(Serializable):
                 counter += 1
                 self.outputs.append(socket)
 
+    @property
+    def scene(self):
+        return self._scene()
+
     def setMode(self, mode):
         self.scene.mode = mode
 
@@ -171,27 +330,60 @@ class Node(Serializable):
     @title.setter
     def title(self, value):
         self._title = value
-        self.grNode.title = value
+        if self.grNode is not None:
+            self.grNode.title = value
 
     @property
     def pos(self):
-        return self.grNode.pos()
+        return self.scene.geometry.getPos(self.slot)
 
     def setPos(self, x, y):
-        self.grNode.setPos(x, y)
+        self.scene.geometry.setPos(self.slot, x, y)
+        self._anchors = None
+        self.scene.onNodesMoved((self,))
+        self.updateEdges()
+
+    def setSize(self, w, h):
+        self.scene.geometry.setSize(self.slot, w, h)
+        self._anchors = None
+        if self.grNode is not None:
+            self.grNode.relayout()
+        self.updateEdges()
+
+    @property
+    def width(self):
+        return float(self.scene.geometry.w[self.slot])
+
+    @property
+    def height(self):
+        return float(self.scene.geometry.h[self.slot])
 
     def getSocketPosition(self, index, position):
-        x = 0 if (position in (SocketPosType.LEFT_TOP, SocketPosType.LEFT_BOTTOM)) else self.grNode.width
+        x = 0 if (position in (SocketPosType.LEFT_TOP, SocketPosType.LEFT_BOTTOM)) else self.width
 
         if position in (SocketPosType.LEFT_BOTTOM, SocketPosType.RIGHT_BOTTOM):
             # start from bottom
-            y = self.grNode.height - self.grNode.edge_size - self.grNode.padding - index * self.socket_spacing
+            y = self.height - self.edge_size - self.padding - index * self.socket_spacing
         else:
             # start from top
-            y = self.grNode.title_height + self.grNode.padding + self.grNode.edge_size + index * self.socket_spacing
+            y = self.title_height + self.padding + self.edge_size + index * self.socket_spacing
 
         return [x, y]
 
+    def getSocketAnchor(self, socket):
+        anchors = self._anchors
+        if anchors is None:
+            anchors = self._anchors = {}
+        anchor = anchors.get(socket)
+        if anchor is None:
+            x, y = self.pos
+            sx, sy = socket.getPosition()
+            anchor = anchors[socket] = (x + sx, y + sy)
+        return anchor
+
+    def invalidateAnchors(self):
+        self._anchors = None
+
     def updateEdges(self):
         for socket in self.inputs + self.outputs:
             for edge in socket.edges:
@@ -202,9 +394,9 @@ class Node(Serializable):
             for edge in socket.edges:
                 edge.remove()
 
-        self.scene.grScene.removeItem(self.grNode)
-        self.grNode = None
-        self.scene.removeNode(self)
+        # slot of node removed before is already free
+        if self.scene.removeNode(self):
+            self.scene.geometry.release(self.slot)
 
     def serialize(self):
         inputs, outputs = [], []
@@ -216,8 +408,8 @@ class Node(Serializable):
         return OrderedDict([
             ('id', self.id),
             ('title', self.title),
-            ('pos_x', self.grNode.pos().x()),
-            ('pos_y', self.grNode.pos().y()),
+            ('pos_x', self.pos[0]),
+            ('pos_y', self.pos[1]),
             ('content', self.content.serialize()),
             ('inputs', inputs),
             ('outputs', outputs)
@@ -225,8 +417,6 @@ class Node(Serializable):
 
     def deserialize(self, data, hashmap={}, restore=True):
         # info
-        if restore:
-            self.id = data['id']
         hashmap[data['id']] = self
         self.title = data['title']
         self.setPos(data['pos_x'], data['pos_y'])
@@ -243,7 +433,7 @@ class Node(Serializable):
             position = socket_data['position']
             socket_type = socket_data['socket_type']
             new_socket = Socket(node=self, index=index, position=position, widget_type=socket_type,
-                                multi_edges=False)
+                                multi_edges=False, item_id=socket_data['id'] if restore else None)
             new_socket.deserialize(data=socket_data, hashmap=hashmap, restore=restore)
             self.inputs.append(new_socket)
 
@@ -252,7 +442,7 @@ class Node(Serializable):
             position = socket_data['position']
             socket_type = socket_data['socket_type']
             new_socket = Socket(node=self, index=index, position=position, widget_type=socket_type,
-                                multi_edges=True)
+                                multi_edges=True, item_id=socket_data['id'] if restore else None)
             new_socket.deserialize(data=socket_data, hashmap=hashmap, restore=restore)
             self.outputs.append(new_socket)
 
@@ -262,11 +452,18 @@ class Node(Serializable):
 
 
 class NodeContent(Serializable):
+    __slots__ = ('_node', 'grContent', 'text')
 
-    def __init__(self, node):
-        super().__init__()
-        self.node = node
-        self.grContent = NodeContentWidget(self)
+    def __init__(self, node, item_id=None):
+        super().__init__(node.scene.ids, item_id)
+        self._node = weakref.ref(node)
+        self.grContent = None
+        # text of content is kept here while node has no widget
+        self.text = "foo"
+
+    @property
+    def node(self):
+        return self._node()
 
     def setMode(self, mode):
         self.node.setMode(mode)
@@ -284,38 +481,44 @@ class NodeContent(Serializable):
 
 
 class Socket(Serializable):
+    __slots__ = ('_node', 'index', 'position', 'socket_type', 'multi_edges', 'grSocket', 'edges')
 
-    def __init__(self, node, index=0, position=SocketPosType.LEFT_TOP, widget_type=SocketType.DEFAULT, multi_edges=True):
-        super().__init__()
-        self.node = node
+    def __init__(self, node, index=0, position=SocketPosType.LEFT_TOP, widget_type=SocketType.DEFAULT, multi_edges=True, item_id=None):
+        super().__init__(node.scene.ids, item_id)
+        self._node = weakref.ref(node)
         self.index = index
         self.position = position
         self.socket_type = widget_type
         self.multi_edges = multi_edges
-        self.grSocket = SocketWidget(self, widget_type)
-        self.grSocket.setPos(*self.node.getSocketPosition(index, position))
-        self.edges = []
+        self.edges = Registry()
+        self.grSocket = None
+        if node.grNode is not None:
+            node.grNode.addSocket(self)
+
+    @property
+    def node(self):
+        return self._node()
 
     def __str__(self):
         return "<Socket %s %s..%s>" % ("Multi-Edge" if self.multi_edges else "Single-Edge", hex(id(self))[2:5], hex(id(self))[-3:])
 
     def addEdge(self, edge):
-        self.edges.append(edge)
+        self.edges.add(edge)
 
     def removeEdge(self, edge):
-        if edge in self.edges:
-            self.edges.remove(edge)
-        else:
+        if not self.edges.remove(edge):
             log(self, "removeEdge: can't remove edge=%s" % edge)
 
     def removeEdges(self):
-        while self.edges:
-            edge = self.edges.pop(0)
+        for edge in self.edges:
             edge.remove()
 
     def getPosition(self):
         return self.node.getSocketPosition(index=self.index, position=self.position)
 
+    def getScenePosition(self):
+        return self.node.getSocketAnchor(self)
+
     def serialize(self):
         return OrderedDict([
             ('id', self.id),
@@ -326,8 +529,6 @@ class Socket(Serializable):
         ])
 
     def deserialize(self, data, hashmap={}, restore=True):
-        if restore:
-            self.id = data['id']
         self.multi_edges = data['multi_edges']
         hashmap[data['id']] = self
         return True
@@ -336,21 +537,26 @@ class Socket(Serializable):
 
 
 class Edge(Serializable):
+    __slots__ = ('_scene', '_start_socket', '_end_socket', '_edge_type', 'grEdge')
 
-    def __init__(self, scene, start_socket=None, end_socket=None, edge_type=EdgeType.Direct):
-        super().__init__()
+    def __init__(self, scene, start_socket=None, end_socket=None, edge_type=EdgeType.Direct, item_id=None):
+        super().__init__(scene.ids, item_id)
 
         self._start_socket = None
         self._end_socket = None
 
-        self.scene = scene
-        self.grEdge = EdgeWidget(self)
-        self.scene.grScene.addItem(self.grEdge)
-        self.scene.addEdge(self)
+        self._scene = weakref.ref(scene)
+        self.grEdge = None
+        self._edge_type = edge_type
 
         self.start_socket = start_socket
         self.end_socket = end_socket
-        self.edge_type = edge_type
+        # associate to scene, presentation is created by scene observer
+        self.scene.addEdge(self)
+
+    @property
+    def scene(self):
+        return self._scene()
 
     @property
     def start_socket(self):
@@ -383,6 +589,8 @@ class Edge(Serializable):
     @edge_type.setter
     def edge_type(self, value):
         self._edge_type = value
+        if self.grEdge is not None:
+            self.grEdge.invalidatePath()
         self.updatePositions()
 
     def __str__(self):
@@ -390,25 +598,20 @@ class Edge(Serializable):
 
     # update source and dest graphical positions
     def updatePositions(self):
+        if self.grEdge is None or self.scene.deferEdgeUpdate(self):
+            return
         # update source position
         start = None
         if self.start_socket is not None:
-            start = self.start_socket.getPosition()
-            start[0] += self.start_socket.node.grNode.pos().x()
-            start[1] += self.start_socket.node.grNode.pos().y()
+            start = self.start_socket.getScenePosition()
             self.grEdge.setSource(*start)
         # update end position
         if self.end_socket is not None:
-            end = self.end_socket.getPosition()
-            end[0] += self.end_socket.node.grNode.pos().x()
-            end[1] += self.end_socket.node.grNode.pos().y()
-            self.grEdge.setDest(*end)
+            self.grEdge.setDest(*self.end_socket.getScenePosition())
         else:
             if start is not None:
                 self.grEdge.setDest(*start)
         # update edge
-        log(self, "StartSocket: %s" % self.start_socket)
-        log(self, "EndSocket: %s" % self.end_socket)
         self.grEdge.update()
 
     # remove from all socket slots
@@ -419,12 +622,7 @@ class Edge(Serializable):
     # remove from scene
     def remove(self):
         self.unbindAll()
-        self.scene.grScene.removeItem(self.grEdge)
-        self.grEdge = None
-        try:
-            self.scene.removeEdge(self)
-        except ValueError:
-            pass
+        self.scene.removeEdge(self)
 
     def serialize(self):
         return OrderedDict([
@@ -435,8 +633,6 @@ class Edge(Serializable):
         ])
 
     def deserialize(self, data, hashmap={}, restore=True):
-        if restore:
-            self.id = data['id']
         self.start_socket = hashmap[data['start']]
         self.end_socket = hashmap[data['end']]
         self.edge_type = data['edge_type']
@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class GeometryFlags:
+    NONE = 0
+    ALIVE = 1
+
+
+# struct-of-arrays storage of node geometry, indexed by dense node slot
+class GeometryStore:
+
+    def __init__(self, capacity=256):
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.w = np.zeros(capacity, dtype=np.float64)
+        self.h = np.zeros(capacity, dtype=np.float64)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.items = [None] * capacity
+        self._free = []
+        self._size = 0
+
+    def __len__(self):
+        return self._size - len(self._free)
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _grow(self, capacity):
+        count = capacity - self.capacity
+        self.x = np.concatenate((self.x, np.zeros(count, dtype=self.x.dtype)))
+        self.y = np.concatenate((self.y, np.zeros(count, dtype=self.y.dtype)))
+        self.w = np.concatenate((self.w, np.zeros(count, dtype=self.w.dtype)))
+        self.h = np.concatenate((self.h, np.zeros(count, dtype=self.h.dtype)))
+        self.flags = np.concatenate((self.flags, np.zeros(count, dtype=self.flags.dtype)))
+        self.items.extend([None] * count)
+
+    def allocate(self, item, x=0.0, y=0.0, w=0.0, h=0.0):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._size == self.capacity:
+                self._grow(2 * self.capacity)
+            slot = self._size
+            self._size += 1
+        self.x[slot], self.y[slot], self.w[slot], self.h[slot] = x, y, w, h
+        self.flags[slot] = GeometryFlags.ALIVE
+        self.items[slot] = item
+        return slot
+
+    def release(self, slot):
+        self.flags[slot] = GeometryFlags.NONE
+        self.items[slot] = None
+        self._free.append(slot)
+
+    def getPos(self, slot):
+        return float(self.x[slot]), float(self.y[slot])
+
+    def setPos(self, slot, x, y):
+        self.x[slot] = x
+        self.y[slot] = y
+
+    def getSize(self, slot):
+        return float(self.w[slot]), float(self.h[slot])
+
+    def setSize(self, slot, w, h):
+        self.w[slot] = w
+        self.h[slot] = h
+
+    def alive(self):
+        return np.flatnonzero(self.flags[:self._size] & GeometryFlags.ALIVE)
+
+    def translate(self, slots, dx, dy):
+        self.x[slots] += dx
+        self.y[slots] += dy
+
+    # returns (left, top, right, bottom) of given slots or of all alive slots
+    def bounds(self, slots=None):
+        if slots is None:
+            slots = self.alive()
+        if len(slots) == 0:
+            return None
+        x, y = self.x[slots], self.y[slots]
+        return (
+            float(x.min()),
+            float(y.min()),
+            float((x + self.w[slots]).max()),
+            float((y + self.h[slots]).max()),
+        )
+
+    # returns alive slots intersecting given rect
+    def query(self, left, top, right, bottom):
+        n = self._size
+        x, y = self.x[:n], self.y[:n]
+        mask = (self.flags[:n] & GeometryFlags.ALIVE).astype(bool)
+        mask &= x <= right
+        mask &= y <= bottom
+        mask &= x + self.w[:n] >= left
+        mask &= y + self.h[:n] >= top
+        return np.flatnonzero(mask)
+
+    # returns alive slots containing given point
+    def hit(self, x, y):
+        return self.query(x, y, x, y)
+
+    def getItems(self, slots):
+        items = self.items
+        return [items[slot] for slot in slots]
@@ -0,0 +1,60 @@
+# selected nodes and edges of scene, membership checks are O(1) and selected items are listed in O(selected),
+# presentation records selection changed by user and shows bulk changes made through select and deselect
+class Selection:
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.nodes = {}
+        self.edges = {}
+
+    def __len__(self):
+        return len(self.nodes) + len(self.edges)
+
+    def __bool__(self):
+        return bool(self.nodes) or bool(self.edges)
+
+    def __contains__(self, item):
+        return item in self.nodes or item in self.edges
+
+    def getNodes(self):
+        return list(self.nodes)
+
+    def getEdges(self):
+        return list(self.edges)
+
+    def select(self, nodes=(), edges=()):
+        nodes = [node for node in dict.fromkeys(nodes) if node not in self.nodes and node in self.scene.nodes]
+        edges = [edge for edge in dict.fromkeys(edges) if edge not in self.edges and edge in self.scene.edges]
+        self.nodes.update(dict.fromkeys(nodes))
+        self.edges.update(dict.fromkeys(edges))
+        self._notify(nodes, edges, True)
+
+    def deselect(self, nodes=(), edges=()):
+        nodes = [node for node in dict.fromkeys(nodes) if node in self.nodes]
+        edges = [edge for edge in dict.fromkeys(edges) if edge in self.edges]
+        for node in nodes:
+            del self.nodes[node]
+        for edge in edges:
+            del self.edges[edge]
+        self._notify(nodes, edges, False)
+
+    def clear(self):
+        self.deselect(tuple(self.nodes), tuple(self.edges))
+
+    def _notify(self, nodes, edges, selected):
+        if (nodes or edges) and self.scene.grScene is not None:
+            self.scene.grScene.onSelectionChanged(nodes, edges, selected)
+
+    # records selection changed by presentation, which already shows it
+
+    def setNodeSelected(self, node, selected):
+        if selected:
+            self.nodes[node] = None
+        else:
+            self.nodes.pop(node, None)
+
+    def setEdgeSelected(self, edge, selected):
+        if selected:
+            self.edges[edge] = None
+        else:
+            self.edges.pop(edge, None)
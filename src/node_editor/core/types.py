@@ -0,0 +1,21 @@
+class SceneMode:
+    NONE = 0
+    EDGE_DRAG = 1
+    NODE_EDIT = 2
+    EDGE_CUT = 3
+
+
+class SocketPosType:
+    LEFT_TOP = 1
+    LEFT_BOTTOM = 2
+    RIGHT_TOP = 3
+    RIGHT_BOTTOM = 4
+
+
+class SocketType:
+    DEFAULT = 0
+
+
+class EdgeType:
+    Direct = 1
+    Bezier = 2
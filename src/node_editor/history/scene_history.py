@@ -1,6 +1,3 @@
-from src.node_editor.presentation.components import EdgeWidget, NodeWidget
-
-
 class SceneHistory:
 
     def __init__(self, scene):
@@ -39,14 +36,9 @@ class SceneHistory:
     def createStamp(self, description):
         # storing selected items
         selected = {
-            'nodes': [],
-            'edges': []
+            'nodes': [node.id for node in self.scene.getSelectedNodes()],
+            'edges': [edge.id for edge in self.scene.getSelectedEdges()]
         }
-        for item in self.scene.grScene.selectedItems():
-            if isinstance(item, NodeWidget):
-                selected['nodes'].append(item.node.id)
-            elif isinstance(item, EdgeWidget):
-                selected['edges'].append(item.edge.id)
         # returns stamp with scene state
         return {
             'description': description,
@@ -57,11 +49,9 @@ class SceneHistory:
     def restoreStamp(self, stamp):
         self.scene.deserialize(stamp['snapshot'])
         # restoring selected items
-        for selected_id in stamp['selected']['edges']:
-            for edge in self.scene.edges:
-                edge.grEdge.selected = selected_id == edge.id
-                break
-        for selected_id in stamp['selected']['nodes']:
-            for node in self.scene.nodes:
-                node.grNode.selected = selected_id == node.id
-                break
\ No newline at end of file
+        nodes = [self.scene.getNode(node_id) for node_id in stamp['selected']['nodes']]
+        edges = [self.scene.getEdge(edge_id) for edge_id in stamp['selected']['edges']]
+        self.scene.selection.select(
+            [node for node in nodes if node is not None],
+            [edge for edge in edges if edge is not None]
+        )
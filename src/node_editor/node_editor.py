@@ -3,6 +3,7 @@ import random
 
 from src.node_editor.core.components import *
 from src.node_editor.node_view import NodeGraphicsView
+from src.node_editor.presentation.components import *
 
 
 class NodeEditor(QWidget):
@@ -25,32 +26,36 @@ class NodeEditor(QWidget):
         self.setLayout(self.layout)
         # create scene
         self.scene = Scene()
+        grScene = NodeGraphicsScene(self.scene)
+        grScene.setVirtualized(True)
+        self.scene.attach(grScene)
         self.addNodes()
         # create presentation view
         self.view = NodeGraphicsView(self.scene, self)
         self.layout.addWidget(self.view)
 
     def addNodes(self):
-        nodes = []
-        for i in range(0, 3):
-            node = Node(
+        with self.scene.batch():
+            nodes = []
+            for i in range(0, 3):
+                node = Node(
+                    self.scene,
+                    "TestNode_%s" % i,
+                    inputs=[i, i, i],
+                    outputs=[1]
+                )
+                node.setPos(random.randrange(-300, 300), random.randrange(-300, 300))
+                nodes.append(node)
+            # create edges
+            Edge(
                 self.scene,
-                "TestNode_%s" % i,
-                inputs=[i, i, i],
-                outputs=[1]
+                nodes[0].outputs[0],
+                nodes[1].inputs[0],
+                edge_type=EdgeType.Bezier
+            )
+            Edge(
+                self.scene,
+                nodes[1].outputs[0],
+                nodes[2].inputs[0],
+                edge_type=EdgeType.Bezier
             )
-            node.setPos(random.randrange(-300, 300), random.randrange(-300, 300))
-            nodes.append(node)
-        # create edges
-        Edge(
-            self.scene,
-            nodes[0].outputs[0],
-            nodes[1].inputs[0],
-            edge_type=EdgeType.Bezier
-        )
-        Edge(
-            self.scene,
-            nodes[1].outputs[0],
-            nodes[2].inputs[0],
-            edge_type=EdgeType.Bezier
-        )
@@ -1,20 +1,30 @@
+import math
+
 from PyQt5.QtCore import QEvent, pyqtSignal
-from PyQt5.QtGui import QPainter, QMouseEvent
+from PyQt5.QtGui import QMouseEvent
 from PyQt5.QtWidgets import QGraphicsView
 
 from src.node_editor.core.components import Edge
 from src.node_editor.presentation.components import *
+from src.node_editor.presentation.render_quality import RenderQuality
 from src.core.logger import log
+from src.core.polyline import simplifyPolyline, polylinesIntersectSegments
 
 
 class NodeGraphicsView(QGraphicsView):
 
     scenePosChanged = pyqtSignal(int, int)
 
-    def __init__(self, scene, parent=None):
+    def __init__(self, scene, parent=None, render_quality=None):
         super().__init__(parent)
         # scene
         self.scene = scene
+        # render quality
+        self.renderQuality = render_quality if render_quality is not None else RenderQuality()
+        self.renderQuality.observeIdle(self._onRenderIdle)
+        # tile cache used while panning, optional
+        self.tileCache = None
+        self._panning = False
         self.init()
         self.setScene(scene.grScene)
         # zooming
@@ -27,9 +37,14 @@ class NodeGraphicsView(QGraphicsView):
         self.edgeDragThreshold = 10
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.rubberBandDragRect = False
+        self.rubberBandChanged.connect(self._onRubberBandChanged)
         # cutting line
         self.cutLine = CutLineWidget()
         self.scene.grScene.addItem(self.cutLine)
+        # longest piece of cut line looked up in scene index at once
+        self.cutQueryLength = 256
+        # mouse moves closer to last point of cut line in device pixels are dropped
+        self.cutMinDistance = 2
         # mouse
         self.lastMousePos = None
 
@@ -37,17 +52,17 @@ class NodeGraphicsView(QGraphicsView):
         return "<Node %s..%s>" % (hex(id(self))[2:5], hex(id(self))[-3:])
 
     def init(self):
-        self.setRenderHints(
-            QPainter.Antialiasing |
-            QPainter.HighQualityAntialiasing |
-            QPainter.TextAntialiasing |
-            QPainter.SmoothPixmapTransform
-        )
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        self.renderQuality.attach(self)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 
+    def setTileCache(self, tile_cache):
+        if self.tileCache is not None:
+            self.tileCache.detach()
+        self.tileCache = tile_cache
+        self._updateVisibleRect()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MiddleButton:
             self.middleMouseButtonPress(event)
@@ -77,6 +92,7 @@ class NodeGraphicsView(QGraphicsView):
         fakeEvent = QMouseEvent(event.type(), event.localPos(), event.screenPos(),
                                 Qt.LeftButton, event.buttons() | Qt.LeftButton, event.modifiers())
         super().mousePressEvent(fakeEvent)
+        self._panning = True
 
     def middleMouseButtonRelease(self, event):
         print("middleMouseButtonRelease")
@@ -84,13 +100,17 @@ class NodeGraphicsView(QGraphicsView):
                                 Qt.LeftButton, event.buttons() & -Qt.LeftButton, event.modifiers())
         super().mouseReleaseEvent(fakeEvent)
         self.setDragMode(QGraphicsView.DragMode.RubberBandDrag)
+        self._panning = False
+        self._updateVisibleRect()
+        if self.tileCache is not None:
+            self.tileCache.prefetch(self._visibleRect())
 
     def leftMouseButtonPress(self, event):
         item = self._pickItem(event)
 
         self.lastPressedItemPos = self.mapToScene(event.pos())
 
-        if type(item) is SocketWidget:
+        if isinstance(item, (SocketWidget, SocketHandle)):
             if self.scene.mode == SceneMode.NONE:
                 self.scene.mode = SceneMode.EDGE_DRAG
                 self._edgeDragStart(item)
@@ -115,7 +135,17 @@ class NodeGraphicsView(QGraphicsView):
         QApplication.setOverrideCursor(Qt.CrossCursor)
 
     def _pickItem(self, event):
-        return self.itemAt(event.pos())
+        item = self.itemAt(event.pos())
+        # edge layer is hit anywhere within its bounds, only edge under cursor counts
+        edge_layer = self.scene.grScene.edge_layer
+        if item is not None and item is edge_layer:
+            return edge_layer.edgeAt(self.mapToScene(event.pos()))
+        # sockets painted inline by node are resolved from node geometry
+        if isinstance(item, NodeWidget) and item.inline_sockets:
+            socket = item.socketAt(item.mapFromScene(self.mapToScene(event.pos())))
+            if socket is not None:
+                return socket.grSocket
+        return item
 
     def leftMouseButtonRelease(self, event):
         item = self._pickItem(event)
@@ -138,20 +168,46 @@ class NodeGraphicsView(QGraphicsView):
 
         super().mouseReleaseEvent(event)
 
+    def _onRubberBandChanged(self, rect, from_pos, to_pos):
+        # edges drawn by edge layer aren't reached by scene selection area
+        edge_layer = self.scene.grScene.edge_layer
+        if edge_layer is not None and not rect.isNull():
+            add = bool(QApplication.keyboardModifiers() & Qt.ControlModifier)
+            edge_layer.setSelectionRect(QRectF(from_pos, to_pos).normalized(), add)
+
     def _endCutLine(self):
         self._cutIntersectingEdges()
-        self.cutLine.line_points = []
-        self.cutLine.update()
+        self.cutLine.clear()
         QApplication.setOverrideCursor(Qt.ArrowCursor)
         self.scene.mode = SceneMode.NONE
 
     def _cutIntersectingEdges(self):
-        for i in range(len(self.cutLine.line_points) - 1):
-            p1 = self.cutLine.line_points[i]
-            p2 = self.cutLine.line_points[i + 1]
-            for edge in self.scene.edges:
-                if edge.grEdge.intersectsWith(p1, p2):
-                    edge.remove()
+        # points closer than device pixel to simplified cut line don't change what it crosses
+        tolerance = 1.0 / self.transform().m11()
+        points = simplifyPolyline([(point.x(), point.y()) for point in self.cutLine.line_points], tolerance)
+        # pairs of edge and cut segment, whose bounding rects intersect, are tested all at once
+        grEdges = {}
+        owners, segments = [], []
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            # edges are prefiltered by scene index, before their polylines are tested,
+            # long segments are queried in pieces, so that their bounding rects stay small
+            pieces = max(1, math.ceil(math.hypot(x2 - x1, y2 - y1) / self.cutQueryLength))
+            candidates = {}
+            for i in range(pieces):
+                q1 = QPointF(x1 + (x2 - x1) * i / pieces, y1 + (y2 - y1) * i / pieces)
+                q2 = QPointF(x1 + (x2 - x1) * (i + 1) / pieces, y1 + (y2 - y1) * (i + 1) / pieces)
+                rect = QRectF(q1, q2).normalized().adjusted(-1, -1, 1, 1)
+                candidates.update(dict.fromkeys(self.scene.grScene.getEdgesIn(rect)))
+            bounds = QRectF(QPointF(x1, y1), QPointF(x2, y2)).normalized().adjusted(-1, -1, 1, 1)
+            for grEdge in candidates:
+                if grEdge.boundingRect().intersects(bounds):
+                    owners.append(grEdges.setdefault(grEdge, len(grEdges)))
+                    segments.append((x1, y1, x2, y2))
+        grEdges = list(grEdges)
+        hits = polylinesIntersectSegments([grEdge.getPolyline() for grEdge in grEdges], owners, segments)
+        cut = dict.fromkeys(grEdges[owner].edge for owner, hit in zip(owners, hits) if hit)
+        for edge in cut:
+            edge.remove()
 
         self.scene.history.store("View::_cutIntersectingEdges", modified=True)
 
@@ -169,7 +225,7 @@ class NodeGraphicsView(QGraphicsView):
         self.dragEdge.remove()
         self.dragEdge = None
 
-        if type(item) is SocketWidget:
+        if isinstance(item, (SocketWidget, SocketHandle)):
             if item.socket != self.previousStartSocket:
                 log(self, "Assign EndSocket")
                 # remove old edges from "single-edge" sockets
@@ -207,9 +263,60 @@ class NodeGraphicsView(QGraphicsView):
         if self.zoom < self.zoomRange[0]: self.zoom, clamped = self.zoomRange[0], True
         if self.zoom > self.zoomRange[1]: self.zoom, clamped = self.zoomRange[1], True
         if not clamped or self.zoomClamp is False:
+            self.renderQuality.interact()
+            self.scene.grScene.cache_policy.bypass()
             self.scale(zoomFactor, zoomFactor)
+            level = DetailLevel.fromScale(self.transform().m11())
+            # virtualizer is suspended at aggregated level, so it must not see
+            # visible rect of far zoom before suspending or the old one after resuming
+            if level == DetailLevel.AGGREGATED:
+                self.scene.grScene.setDetailLevel(level)
+                self._updateVisibleRect()
+            else:
+                self._updateVisibleRect()
+                self.scene.grScene.setDetailLevel(level)
+
+    def _onRenderIdle(self, rect):
+        if QGraphicsView.scene(self) is not None:
+            self.scene.grScene.cache_policy.restore(rect)
+            if self.tileCache is not None:
+                self.tileCache.prefetch(self._visibleRect())
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self._updateVisibleRect()
+
+    def paintEvent(self, event):
+        self.renderQuality.beginFrame()
+        # static scene is composited from pre-rendered tiles while panning
+        if not (self._panning and self.tileCache is not None and self.tileCache.paint(event.rect())):
+            super().paintEvent(event)
+        self.renderQuality.endFrame()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._updateVisibleRect()
+
+    def _updateVisibleRect(self):
+        # graphics scene could be already destroyed while view is being torn down
+        if QGraphicsView.scene(self) is None:
+            return
+        virtualizer = self.scene.grScene.virtualizer
+        if virtualizer is not None:
+            virtualizer.setVisibleRect(self._visibleRect())
+
+    def _visibleRect(self):
+        rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        if self.tileCache is not None:
+            # nodes of partially visible tiles have to be materialized before tiles are rendered
+            margin = self.tileCache.sceneMargin()
+            rect.adjust(-margin, -margin, margin, margin)
+        return rect
 
     def mouseMoveEvent(self, event):
+        # panning, node or edge dragging, rubber band or cutting
+        if event.buttons() != Qt.NoButton or self.scene.mode == SceneMode.EDGE_DRAG:
+            self.renderQuality.interact()
         # edge dragging
         if self.scene.mode == SceneMode.EDGE_DRAG:
             pos = self.mapToScene(event.pos())
@@ -218,8 +325,7 @@ class NodeGraphicsView(QGraphicsView):
         # edge cursor cutting
         if self.scene.mode == SceneMode.EDGE_CUT:
             pos = self.mapToScene(event.pos())
-            self.cutLine.line_points.append(pos)
-            self.cutLine.update()
+            self.cutLine.addPoint(pos, self.cutMinDistance / self.transform().m11())
         # notify scene pos changed
         self.lastMousePos = self.mapToScene(event.pos())
         self.scenePosChanged.emit(
@@ -228,12 +334,13 @@ class NodeGraphicsView(QGraphicsView):
         )
 
         super().mouseMoveEvent(event)
+        # nodes moved by this event are brought up to date together, once per frame
+        self.scene.grScene.frame_scheduler.flushIfDue()
 
     def deleteSelected(self):
-        for item in self.scene.grScene.selectedItems():
-            if type(item) == EdgeWidget:
-                item.edge.remove()
-            elif hasattr(item, 'node'):
-                item.node.remove()
+        for edge in self.scene.getSelectedEdges():
+            edge.remove()
+        for node in self.scene.getSelectedNodes():
+            node.remove()
 
         self.scene.history.store("View::_deleteSelected", modified=True)
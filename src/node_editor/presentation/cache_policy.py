@@ -0,0 +1,81 @@
+from PyQt5.QtWidgets import QGraphicsItem
+
+
+NO_CACHE = QGraphicsItem.CacheMode.NoCache
+DEVICE_CACHE = QGraphicsItem.CacheMode.DeviceCoordinateCache
+ITEM_CACHE = QGraphicsItem.CacheMode.ItemCoordinateCache
+
+DEFAULT_CACHE_MODES = {
+    "node": DEVICE_CACHE,
+    "content": DEVICE_CACHE,
+    "socket": DEVICE_CACHE,
+    "edge": NO_CACHE,
+}
+
+
+# chooses cache mode of presentation items by their cache_kind,
+# caches are bypassed while zooming, because device caches would be re-rasterized on every step
+class CachePolicy:
+
+    def __init__(self, grScene, modes=DEFAULT_CACHE_MODES, enabled=True):
+        self.grScene = grScene
+        self.modes = dict(modes)
+        self.enabled = enabled
+        self.bypassed = False
+
+    def modeFor(self, kind):
+        if not self.enabled or self.bypassed:
+            return NO_CACHE
+        return self.modes.get(kind, NO_CACHE)
+
+    def apply(self, item, kind=None):
+        kind = kind if kind is not None else getattr(item, 'cache_kind', None)
+        if kind is not None:
+            item.setCacheMode(self.modeFor(kind))
+
+    # applies policy to node widget together with its content and socket widgets
+    def applyNode(self, grNode):
+        self.apply(grNode)
+        self.apply(grNode.grContent, "content")
+        for child in grNode.childItems():
+            if child is not grNode.grContent:
+                self.apply(child)
+
+    def applyAll(self):
+        for item in self.grScene.items():
+            if getattr(item, 'cache_kind', None) == "node":
+                self.applyNode(item)
+            elif item.parentItem() is None:
+                self.apply(item)
+
+    def setModes(self, modes):
+        self.modes = dict(modes)
+        self.applyAll()
+
+    def setEnabled(self, enabled):
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.applyAll()
+
+    def bypass(self):
+        if not self.bypassed:
+            self.bypassed = True
+            if self.enabled:
+                self.applyAll()
+
+    # re-enables caches after zooming and re-renders items cached with cheap render hints
+    def restore(self, rect=None):
+        if self.bypassed:
+            self.bypassed = False
+            if self.enabled:
+                self.applyAll()
+        elif rect is not None and self.enabled:
+            for item in self.grScene.items(rect):
+                if item.cacheMode() != NO_CACHE:
+                    item.update()
+
+    # drops cached pixmaps of all items, e.g. after theme change
+    def invalidate(self):
+        for item in self.grScene.items():
+            if item.cacheMode() != NO_CACHE:
+                item.update()
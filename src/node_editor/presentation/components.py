@@ -1,113 +1,485 @@
 import math
 
+import numpy as np
 from PyQt5.QtCore import QLine, Qt, QRectF, QPointF
 from PyQt5.QtGui import *
 from PyQt5.QtWidgets import *
 
+from src.core.polyline import polylineIntersectsSegment
+from src.node_editor.core.types import *
+from src.node_editor.presentation.cache_policy import CachePolicy
+from src.node_editor.presentation.frame_scheduler import FrameScheduler
+from src.node_editor.presentation.style import style_registry
+from src.node_editor.presentation.virtualizer import NodeVirtualizer
+
 
 # ----------------- Scene UI -------------------- #
 
-class SceneMode:
-    NONE = 0
-    EDGE_DRAG = 1
-    NODE_EDIT = 2
-    EDGE_CUT = 3
+class DetailLevel:
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+    # nodes and edges are replaced by density layer, if scene has one
+    AGGREGATED = 3
+
+    # lowest view scale, at which each level is still used
+    MEDIUM_SCALE = 0.5
+    LOW_SCALE = 0.25
+    AGGREGATED_SCALE = 0.125
+
+    @staticmethod
+    def fromScale(scale):
+        if scale < DetailLevel.AGGREGATED_SCALE:
+            return DetailLevel.AGGREGATED
+        if scale < DetailLevel.LOW_SCALE:
+            return DetailLevel.LOW
+        if scale < DetailLevel.MEDIUM_SCALE:
+            return DetailLevel.MEDIUM
+        return DetailLevel.HIGH
 
 
 class NodeGraphicsScene(QGraphicsScene):
+
+    styles = style_registry
+
     def __init__(self, scene, parent=None):
         super().__init__(parent)
 
         self.scene = scene
+        self.virtualizer = None
+        self.edge_layer = None
+        self.density_layer = None
+        self.inline_sockets = False
+        self.detail_level = DetailLevel.HIGH
+        self.cache_policy = CachePolicy(self)
+        self.frame_scheduler = FrameScheduler(self)
+        # bulk update rebuilds item index, only when it changes at least this share of scene items
+        self.bulk_index_share = 0.25
+        self._index_suspended = False
+
+        self._grid_size = 20
+        self._grid_squares = 5
+        # smallest spacing of grid lines in device pixels
+        self.min_grid_spacing = 4
+
+        self._color_background = QColor(self.styles.color("scene.background"))
+        self._color_light = QColor(self.styles.color("scene.grid.light"))
+        self._color_dark = QColor(self.styles.color("scene.grid.dark"))
+
+        self._pen_light = None
+        self._pen_dark = None
+        self._init_pens()
+
+        # grid lines are evaluated once for area around exposed rect and drawn while it's covered
+        self._grid_lines = None
+        self._grid_rect = QRectF()
+        self._grid_scale = 0
 
-        self.gridSize = 20
-        self.gridSquares = 5
-
-        self._color_background = QColor("#393939")
-        self._color_light = QColor("#2f2f2f")
-        self._color_dark = QColor("#292929")
+        self.setBackgroundBrush(self._color_background)
+        # registry is shared by all scenes, each restyles itself whenever theme changes
+        self.styles.observeTheme(self._onThemeChanged)
 
+    def _init_pens(self):
         self._pen_light = QPen(self._color_light)
         self._pen_light.setWidth(1)
         self._pen_dark = QPen(self._color_dark)
         self._pen_dark.setWidth(2)
 
+    @property
+    def gridSize(self):
+        return self._grid_size
+
+    @gridSize.setter
+    def gridSize(self, value):
+        self._grid_size = value
+        self.invalidateGrid()
+
+    @property
+    def gridSquares(self):
+        return self._grid_squares
+
+    @gridSquares.setter
+    def gridSquares(self, value):
+        self._grid_squares = value
+        self.invalidateGrid()
+
+    def setColors(self, background, light, dark):
+        self._color_background = QColor(background)
+        self._color_light = QColor(light)
+        self._color_dark = QColor(dark)
+        self._init_pens()
         self.setBackgroundBrush(self._color_background)
+        self.invalidateGrid()
+
+    # switches theme of shared pens, brushes and fonts, then every scene restyles what holds own copies
+    def setTheme(self, theme):
+        self.styles.setTheme(theme)
+
+    def _onThemeChanged(self):
+        styles = self.styles
+        # static titles are laid out with theme font
+        NodeWidget.title_cache.clear()
+        self.cache_policy.invalidate()
+        self.setColors(
+            styles.color("scene.background"),
+            styles.color("scene.grid.light"),
+            styles.color("scene.grid.dark"),
+        )
+
+    def invalidateGrid(self):
+        self._grid_lines = None
+        self.update()
 
     def setGrScene(self, width, height):
         self.setSceneRect(-width // 2, -height // 2, width, height)
 
+    # virtualized scene materializes node widgets only around visible rect of the view
+    def setVirtualized(self, enabled):
+        if enabled == (self.virtualizer is not None):
+            return
+        if enabled:
+            self.virtualizer = NodeVirtualizer(self)
+        else:
+            self.virtualizer.clear()
+            self.virtualizer = None
+            for node in self.scene.nodes:
+                if node.grNode is None:
+                    self.createNodeWidget(node)
+
+    # edge layer draws all edges through single item instead of edge widget per edge
+    def setEdgeLayer(self, layer):
+        edges = [edge for edge in self.scene.edges if edge.grEdge is not None]
+        self.beginBulkUpdate(2 * len(edges))
+        for edge in edges:
+            self.onEdgeRemoved(edge)
+        if self.edge_layer is not None:
+            self.removeItem(self.edge_layer)
+        self.edge_layer = layer
+        if layer is not None:
+            self.addItem(layer)
+        self.onEdgesAdded(edges)
+        self.endBulkUpdate()
+
+    # density layer replaces nodes and edges at aggregated detail level
+    def setDensityLayer(self, layer):
+        if self.aggregated:
+            self._showAggregated(False)
+        if self.density_layer is not None:
+            self.removeItem(self.density_layer)
+        self.density_layer = layer
+        if layer is not None:
+            layer.rebuild(self.scene.geometry)
+            self.addItem(layer)
+            self._showAggregated(self.aggregated)
+
+    @property
+    def aggregated(self):
+        return self.density_layer is not None and self.detail_level == DetailLevel.AGGREGATED
+
+    def _showAggregated(self, aggregated):
+        if self.virtualizer is not None:
+            self.virtualizer.setSuspended(aggregated)
+        for node in self.scene.nodes:
+            if node.grNode is not None:
+                node.grNode.setVisible(not aggregated)
+        for edge in self.scene.edges:
+            if isinstance(edge.grEdge, EdgeWidget):
+                edge.grEdge.setVisible(not aggregated)
+        if self.edge_layer is not None:
+            self.edge_layer.setVisible(not aggregated)
+        self.density_layer.setVisible(aggregated)
+        if not aggregated:
+            # Qt deselects hidden items, while scene selection keeps them
+            selection = self.scene.selection
+            self.onSelectionChanged(selection.getNodes(), selection.getEdges(), True)
+
+    # node widgets paint their sockets instead of holding socket widgets
+    def setInlineSockets(self, enabled):
+        self.inline_sockets = enabled
+        for item in self.items():
+            if isinstance(item, NodeWidget):
+                item.setInlineSockets(enabled)
+
+    def createNodeWidget(self, node):
+        grNode = NodeWidget(node, self.inline_sockets)
+        grNode.setDetailLevel(self.detail_level)
+        grNode.setVisible(not self.aggregated)
+        self.cache_policy.applyNode(grNode)
+        self.addItem(grNode)
+
+    def setDetailLevel(self, level):
+        if level == self.detail_level:
+            return
+        aggregated = self.aggregated
+        self.detail_level = level
+        if self.aggregated != aggregated:
+            self._showAggregated(self.aggregated)
+        for node in self.scene.nodes:
+            if node.grNode is not None:
+                node.grNode.setDetailLevel(level)
+        self.update()
+
+    def destroyNodeWidget(self, node):
+        grNode = node.grNode
+        grNode.unbind()
+        self.removeItem(grNode)
+
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
-        # create grid view
+        scale = painter.worldTransform().m11()
+        if self._grid_lines is None or self._grid_scale != scale or not self._grid_rect.contains(rect):
+            self._evalGrid(rect, scale)
+        lines_light, lines_dark = self._grid_lines
+        painter.setPen(self._pen_light)
+        painter.drawLines(lines_light)
+        painter.setPen(self._pen_dark)
+        painter.drawLines(lines_dark)
+
+    def _evalGrid(self, rect, scale):
+        # cover neighbourhood of exposed rect, so panning keeps drawing same lines
+        rect = rect.adjusted(-rect.width() / 2, -rect.height() / 2, rect.width() / 2, rect.height() / 2)
         left = int(math.floor(rect.left()))
         right = int(math.ceil(rect.right()))
         bottom = int(math.ceil(rect.bottom()))
         top = int(math.floor(rect.top()))
-        first_left = left - (left % self.gridSize)
-        first_top = top - (top % self.gridSize)
         # eval lines
         lines_light, lines_dark = [], []
         cell = self.gridSize * self.gridSquares
+        # lines closer than few pixels blend into background, when zoomed far out
+        step = self.gridSize if self.gridSize * scale >= self.min_grid_spacing else cell
+        if cell * scale < self.min_grid_spacing:
+            step = None
 
-        for x in range(first_left, right, self.gridSize):
+        for x in range(left - (left % step), right, step) if step else ():
             if x % cell != 0:
                 lines_light.append(QLine(x, top, x, bottom))
             else:
                 lines_dark.append(QLine(x, top, x, bottom))
 
-        for y in range(first_top, bottom, self.gridSize):
+        for y in range(top - (top % step), bottom, step) if step else ():
             if y % cell != 0:
                 lines_light.append(QLine(left, y, right, y))
             else:
                 lines_dark.append(QLine(left, y, right, y))
-        # draw lines
-        painter.setPen(self._pen_light)
-        painter.drawLines(*lines_light)
-        painter.setPen(self._pen_dark)
-        painter.drawLines(*lines_dark)
-
-    def mouseMoveEvent(self, event):
-        super().mouseMoveEvent(event)
 
-        for node in self.scene.nodes:
-            if node.grNode.isSelected():
-                node.updateEdges()
+        self._grid_lines = (lines_light, lines_dark)
+        self._grid_rect = QRectF(left, top, right - left, bottom - top)
+        self._grid_scale = scale
+
+    def mousePressEvent(self, event):
+        # Qt clears selection of its items only, while scene selection also holds nodes without shown widget
+        # and edges of layer, so it's cleared like Qt does for items
+        if event.button() == Qt.LeftButton and not event.modifiers() & Qt.ControlModifier:
+            item = self.itemAt(event.scenePos(), QTransform())
+            # edge layer is hit anywhere within its bounds, only edge under cursor counts
+            if item is not None and item is self.edge_layer and self.edge_layer.edgeAt(event.scenePos()) is None:
+                item = None
+            if item is None or (item is not self.edge_layer and item.parentItem() is None and not item.isSelected()):
+                self.scene.selection.clear()
+        super().mousePressEvent(event)
+
+    # returns presentation of edges, whose bounding rects may intersect given scene rect
+    def getEdgesIn(self, rect):
+        if self.edge_layer is not None:
+            return self.edge_layer.getHandlesIn(rect)
+        items = self.items(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect)
+        return [item for item in items if isinstance(item, EdgeWidget)]
+
+    # scene observer, creates and destroys presentation of model items
+
+    # suspends repaints of views during bulk changes of count items, item indexing is suspended too,
+    # if count is unknown or large enough for rebuilding index to be cheaper than updating it
+    def beginBulkUpdate(self, count=None):
+        total = len(self.scene.nodes) + len(self.scene.edges)
+        self._index_suspended = count is None or count > self.bulk_index_share * total
+        if self._index_suspended:
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        for view in self.views():
+            view.setUpdatesEnabled(False)
+
+    def endBulkUpdate(self):
+        if self._index_suspended:
+            self._index_suspended = False
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+            # new index is sized only on scene rect change, until then every query scans all items
+            self.sceneRectChanged.emit(self.sceneRect())
+        for view in self.views():
+            view.setUpdatesEnabled(True)
+        self.update()
+
+    def onNodesAdded(self, nodes):
+        if self.density_layer is not None:
+            self.density_layer.addNodes(nodes)
+        if self.virtualizer is not None:
+            self.virtualizer.refresh(nodes)
+        else:
+            for node in nodes:
+                self.createNodeWidget(node)
+
+    def onNodeRemoved(self, node):
+        if self.density_layer is not None:
+            self.density_layer.removeNode(node)
+        if node.grNode is None:
+            return
+        if self.virtualizer is not None:
+            self.virtualizer.release(node, force=True)
+        else:
+            self.destroyNodeWidget(node)
+
+    def onNodesMoved(self, nodes):
+        for node in nodes:
+            if node.grNode is not None:
+                node.grNode.setPos(*node.pos)
+        if self.density_layer is not None:
+            self.density_layer.moveNodes(nodes)
+        if self.virtualizer is not None:
+            self.virtualizer.refresh(nodes)
+
+    def onEdgesAdded(self, edges):
+        for edge in edges:
+            if self.edge_layer is not None:
+                edge.grEdge = self.edge_layer.addEdge(edge)
+            else:
+                edge.grEdge = EdgeWidget(edge)
+                edge.grEdge.setVisible(not self.aggregated)
+                self.cache_policy.apply(edge.grEdge)
+                self.addItem(edge.grEdge)
+            if edge in self.scene.selection.edges:
+                edge.grEdge.setSelected(True)
+            edge.updatePositions()
+
+    def onEdgeRemoved(self, edge):
+        # edge added and removed within same batch has no presentation yet
+        if edge.grEdge is None:
+            return
+        if self.edge_layer is not None:
+            self.edge_layer.removeEdge(edge)
+        else:
+            self.removeItem(edge.grEdge)
+        edge.grEdge = None
+
+    def onSelectionChanged(self, nodes, edges, selected):
+        # items would signal their selection change one by one, scene signals whole bulk change once
+        blocked = self.blockSignals(True)
+        try:
+            for node in nodes:
+                if node.grNode is not None:
+                    node.grNode.setSelected(selected)
+            for edge in edges:
+                if edge.grEdge is not None:
+                    edge.grEdge.setSelected(selected)
+        finally:
+            self.blockSignals(blocked)
+        if not blocked:
+            self.selectionChanged.emit()
 
 
 # ----------------- Node UI -------------------- #
 
+# titles are laid out once into static text, shared by nodes with same title and width
+class TitleTextCache:
+
+    def __init__(self, limit=4096):
+        self.limit = limit
+        self._texts = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def get(self, text, width, font):
+        key = (text, width)
+        static = self._texts.get(key)
+        if static is None:
+            if len(self._texts) >= self.limit:
+                self._texts.clear()
+            static = QStaticText(text)
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.setTextWidth(width)
+            static.prepare(QTransform(), font)
+            self._texts[key] = static
+        return static
+
+    def clear(self):
+        self._texts.clear()
+
+
+# node shapes depend only on dimensions, so identical nodes share simplified paths
+class NodePathCache:
+
+    def __init__(self):
+        self._paths = {}
+
+    def __len__(self):
+        return len(self._paths)
+
+    def get(self, width, height, title_height, edge_size):
+        key = (width, height, title_height, edge_size)
+        paths = self._paths.get(key)
+        if paths is None:
+            paths = self._paths[key] = self._createPaths(*key)
+        return paths
+
+    def clear(self):
+        self._paths.clear()
+
+    @staticmethod
+    def _createPaths(width, height, title_height, edge_size):
+        # title
+        path_title = QPainterPath()
+        path_title.setFillRule(Qt.FillRule.WindingFill)
+        path_title.addRoundedRect(0, 0, width, title_height, edge_size, edge_size)
+        path_title.addRect(0, title_height - edge_size, edge_size, edge_size)
+        path_title.addRect(width - edge_size, title_height - edge_size, edge_size, edge_size)
+        # content
+        path_content = QPainterPath()
+        path_content.setFillRule(Qt.FillRule.WindingFill)
+        path_content.addRoundedRect(0, title_height, width, height - title_height, edge_size, edge_size)
+        path_content.addRect(0, title_height, edge_size, edge_size)
+        path_content.addRect(width - edge_size, title_height, edge_size, edge_size)
+        # outline
+        path_outline = QPainterPath()
+        path_outline.addRoundedRect(0, 0, width, height, edge_size, edge_size)
+        return path_title.simplified(), path_content.simplified(), path_outline.simplified()
+
+
 class NodeWidget(QGraphicsItem):
 
-    def __init__(self, node, parent=None):
+    cache_kind = "node"
+    path_cache = NodePathCache()
+    title_cache = TitleTextCache()
+    styles = style_registry
+    # same as document margin of title editor, so text doesn't jump when editing starts
+    title_margin = 4
+
+    def __init__(self, node, inline_sockets=False, parent=None):
         super().__init__(parent)
 
-        self.node = node
+        self.node = None
+        # inline sockets are painted by node itself instead of socket widgets
+        self.inline_sockets = inline_sockets
 
-        self.title_item = QGraphicsTextItem(self)
-        self.title = node.title
-        self._title_color = Qt.GlobalColor.white
-        self._title_font = QFont("Ubuntu", 10)
+        self.title_editor = None
+        self._title = ""
 
-        self.width = 180
-        self.height = 240
-        self.edge_size = 10
-        self.title_height = 24
         self.moved = False
 
-        self._padding = 4.0
+        self._pen_default = self.styles.pen("node.outline")
+        self._pen_selected = self.styles.pen("node.outline.selected")
 
-        self._pen_default = QPen(QColor("#7F000000"))
-        self._pen_selected = QPen(QColor("#FFFFA637"))
+        self._brush_title = self.styles.brush("node.title")
+        self._brush_background = self.styles.brush("node.background")
 
-        self._brush_title = QBrush(QColor("#FF313131"))
-        self._brush_background = QBrush(QColor("#E3212121"))
+        self._socket_items = []
+        self._socket_count = 0
+        self._socket_points = []
+        self._rect = QRectF()
+        self._bounds = QRectF()
+        self._detail_level = DetailLevel.HIGH
 
-        self._init_title()
-        self._init_content()
-        self._init_sockets()
+        self._init_content(node.content)
 
         self._init()
+        self.bind(node)
 
     @property
     def title(self): return self._title
@@ -115,7 +487,78 @@ class NodeWidget(QGraphicsItem):
     @title.setter
     def title(self, value):
         self._title = value
-        self.title_item.setPlainText(self._title)
+        self.update(0, 0, self.width, self.title_height)
+
+    @property
+    def edge_size(self):
+        return self.node.edge_size
+
+    @property
+    def title_height(self):
+        return self.node.title_height
+
+    @property
+    def padding(self):
+        return self.node.padding
+
+    @property
+    def width(self):
+        return self.node.width
+
+    @property
+    def height(self):
+        return self.node.height
+
+    # binds widget to given node, widgets are recycled between nodes by virtualized scene
+    def bind(self, node):
+        self.node = node
+        node.grNode = self
+        self.title = node.title
+        self._layout()
+        self.grContent.widget().bind(node.content)
+        self._init_sockets()
+        self.setPos(*node.pos)
+        self.setVisible(True)
+        self.setSelected(node in node.scene.selection.nodes)
+        # recycled widget must not show cache of previous node
+        self.update()
+
+    def setDetailLevel(self, level):
+        self._detail_level = level
+        self.grContent.setVisible(level == DetailLevel.HIGH)
+        for grSocket in self._socket_items[:self._socket_count]:
+            grSocket.setVisible(level < DetailLevel.LOW)
+        self.update()
+
+    def unbind(self):
+        node = self.node
+        if self.title_editor is not None:
+            self.closeTitleEditor(commit=False)
+        for socket in node.inputs + node.outputs:
+            socket.grSocket = None
+        self.grContent.widget().unbind()
+        node.grNode = None
+        self.node = None
+        # unbound widget doesn't change selection of node
+        self.setSelected(False)
+        self.setVisible(False)
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            node = self.node
+            x, y = value.x(), value.y()
+            # moves made by model have already updated geometry and edges
+            if node.pos != (x, y):
+                # keep scene geometry store in sync with interactive moves,
+                # incident edges follow once per frame
+                node.scene.geometry.setPos(node.slot, x, y)
+                node.invalidateAnchors()
+                node.scene.grScene.frame_scheduler.scheduleNode(node)
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            # Qt deselects hidden widgets, their nodes stay selected
+            if self.node is not None and (value or self.isVisible()):
+                self.node.scene.selection.setNodeSelected(self.node, bool(value))
+        return super().itemChange(change, value)
 
     def mouseMoveEvent(self, event):
         super().mouseMoveEvent(event)
@@ -123,6 +566,7 @@ class NodeWidget(QGraphicsItem):
 
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
+        self.scene().frame_scheduler.flush()
 
         if self.moved:
             self.moved = False
@@ -131,67 +575,170 @@ class NodeWidget(QGraphicsItem):
     def _init(self):
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
+
+    def mouseDoubleClickEvent(self, event):
+        if event.pos().y() < self.title_height and self._detail_level < DetailLevel.LOW:
+            self.openTitleEditor()
+            return
+        super().mouseDoubleClickEvent(event)
+
+    # title editor is created only while title is edited
+    def openTitleEditor(self):
+        if self.title_editor is not None:
+            return
+        editor = TitleEditWidget(self)
+        editor.setDefaultTextColor(self.styles.color("node.title.text"))
+        editor.setFont(self.styles.font("font.title"))
+        editor.setPlainText(self._title)
+        editor.setPos(self.padding, 0)
+        editor.setTextWidth(self.width - 2 * self.padding)
+        self.title_editor = editor
+        self.node.setMode(SceneMode.NODE_EDIT)
+        editor.setFocus()
+        cursor = editor.textCursor()
+        cursor.select(QTextCursor.SelectionType.Document)
+        editor.setTextCursor(cursor)
+        self.update()
+
+    def closeTitleEditor(self, commit=True):
+        editor = self.title_editor
+        if editor is None:
+            return
+        self.title_editor = None
+        text = editor.toPlainText()
+        # editor may be closed from its own focus out event, so it's deleted later
+        editor.setVisible(False)
+        if editor.scene() is not None:
+            editor.scene().removeItem(editor)
+        editor.deleteLater()
+        node = self.node
+        node.setMode(SceneMode.NONE)
+        if commit and text != node.title:
+            node.title = text
+            node.scene.history.store("Node: title changed", modified=True)
+        self.update()
+
+    def _init_content(self, content):
+        self.grContent = QGraphicsProxyWidget(self)
+        self.grContent.setWidget(NodeContentWidget(content))
 
-    def _init_title(self):
-        self.title_item.setDefaultTextColor(self._title_color)
-        self.title_item.setFont(self._title_font)
-        self.title_item.setPos(self._padding, 0)
-        self.title_item.setTextWidth(
-            self.width
-            - 2 * self._padding
-        )
+    def _init_sockets(self):
+        self.prepareGeometryChange()
+        self._rect = QRectF(0, 0, self.width, self.height).normalized()
+        if self.inline_sockets:
+            # inline sockets stick out of node sides
+            extent = SocketWidget.radius + SocketWidget.outline_width
+            self._bounds = self._rect.adjusted(-extent, 0, extent, 0)
+        else:
+            self._bounds = QRectF(self._rect)
+        self._socket_count = 0
+        self._socket_points = []
+        for socket in self.node.inputs + self.node.outputs:
+            self.addSocket(socket)
+        for grSocket in self._socket_items[self._socket_count:]:
+            grSocket.setVisible(False)
+
+    def setInlineSockets(self, enabled):
+        if enabled == self.inline_sockets:
+            return
+        self.inline_sockets = enabled
+        if enabled:
+            for grSocket in self._socket_items:
+                grSocket.setParentItem(None)
+                if grSocket.scene() is not None:
+                    grSocket.scene().removeItem(grSocket)
+            self._socket_items = []
+        if self.node is not None:
+            self._init_sockets()
+            self.update()
+
+    # resolves socket painted inline from its geometry, pos is in item coordinates
+    def socketAt(self, pos):
+        extent = SocketWidget.radius + SocketWidget.outline_width
+        x, y = pos.x(), pos.y()
+        if extent < x < self.width - extent:
+            return None
+        for socket in self.node.inputs + self.node.outputs:
+            sx, sy = socket.getPosition()
+            if (x - sx) ** 2 + (y - sy) ** 2 <= extent * extent:
+                return socket
+        return None
+
+    # lays out content and sockets again after node was resized
+    def relayout(self):
+        self._layout()
+        self._init_sockets()
+        self.update()
 
-    def _init_content(self):
-        self.grContent = QGraphicsProxyWidget(self)
-        content_widget = self.node.content.grContent
-        content_widget.setGeometry(
+    def _layout(self):
+        self.grContent.widget().setGeometry(
             self.edge_size,
             self.title_height + self.edge_size,
-            self.width - 2 * self.edge_size,
-            self.height - 2 * self.edge_size - self.title_height,
+            int(self.width - 2 * self.edge_size),
+            int(self.height - 2 * self.edge_size - self.title_height),
         )
-        self.grContent.setWidget(content_widget)
 
-    def _init_sockets(self):
-        pass
+    def addSocket(self, socket):
+        if self.inline_sockets:
+            socket.grSocket = SocketHandle(socket)
+            self._socket_points.append((QPointF(*socket.getPosition()), self.styles.socketBrush(socket.socket_type)))
+            self.update()
+            return
+        # reuse socket widgets left from previously bound node
+        if self._socket_count < len(self._socket_items):
+            grSocket = self._socket_items[self._socket_count]
+            grSocket.bind(socket)
+        else:
+            grSocket = SocketWidget(socket, socket.socket_type, self)
+            self._socket_items.append(grSocket)
+            if self.scene() is not None:
+                self.scene().cache_policy.apply(grSocket)
+        grSocket.setVisible(self._detail_level < DetailLevel.LOW)
+        self._socket_count += 1
+        socket.grSocket = grSocket
+        grSocket.setPos(*socket.getPosition())
 
     def boundingRect(self):
-        return QRectF(
-            0,
-            0,
-            self.width,
-            self.height
-        ).normalized()
+        return self._bounds
 
     def paint(self, painter, options, widget=None):
+        if self._detail_level >= DetailLevel.LOW:
+            # flat rect is enough, when node covers few pixels
+            painter.setPen(self._pen_default if not self.isSelected() else self._pen_selected)
+            painter.setBrush(self._brush_background)
+            painter.drawRect(self._rect)
+            return
+
+        path_title, path_content, path_outline = self.path_cache.get(
+            self.width, self.height, self.title_height, self.edge_size
+        )
         # title
-        path_title = QPainterPath()
-        path_title.setFillRule(Qt.FillRule.WindingFill)
-        path_title.addRoundedRect(0,0, self.width, self.title_height, self.edge_size, self.edge_size)
-        path_title.addRect(0, self.title_height - self.edge_size, self.edge_size, self.edge_size)
-        path_title.addRect(self.width - self.edge_size, self.title_height - self.edge_size, self.edge_size, self.edge_size)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(self._brush_title)
-        painter.drawPath(path_title.simplified())
+        painter.drawPath(path_title)
+        if self.title_editor is None and self._title:
+            font = self.styles.font("font.title")
+            static = self.title_cache.get(self._title, self.width - 2 * (self.padding + self.title_margin), font)
+            painter.setFont(font)
+            painter.setPen(self.styles.pen("node.title.text"))
+            painter.drawStaticText(QPointF(self.padding + self.title_margin, self.title_margin), static)
+            painter.setPen(Qt.PenStyle.NoPen)
         # content
-        path_content = QPainterPath()
-        path_content.setFillRule(Qt.FillRule.WindingFill)
-        path_content.addRoundedRect(0, self.title_height, self.width, self.height - self.title_height, self.edge_size, self.edge_size)
-        path_content.addRect(0, self.title_height, self.edge_size, self.edge_size)
-        path_content.addRect(self.width - self.edge_size, self.title_height, self.edge_size, self.edge_size)
-        painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(self._brush_background)
-        painter.drawPath(path_content.simplified())
+        painter.drawPath(path_content)
         # outline
-        path_outline = QPainterPath()
-        path_outline.addRoundedRect(0, 0, self.width, self.height, self.edge_size, self.edge_size)
         painter.setPen(self._pen_default if not self.isSelected() else self._pen_selected)
         painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawPath(path_outline.simplified())
+        painter.drawPath(path_outline)
+        # sockets
+        if self._socket_points:
+            radius = SocketWidget.radius
+            painter.setPen(self.styles.socketPen(SocketWidget.outline_width))
+            for center, brush in self._socket_points:
+                painter.setBrush(brush)
+                painter.drawEllipse(center, radius, radius)
 
-    @property
-    def padding(self):
-        return self._padding
 
 # ----------------- NodeContent UI -------------------- #
 
@@ -208,7 +755,39 @@ class NodeContentWidget(QWidget):
         self.setLayout(self.layout)
         self.label = QLabel("Title")
         self.layout.addWidget(self.label)
-        self.layout.addWidget(TextEditWidget(self.content, "foo"))
+        self.text_edit = TextEditWidget(self.content, self.content.text)
+        self.layout.addWidget(self.text_edit)
+
+    def bind(self, content):
+        self.content = content
+        self.text_edit.content = content
+        self.text_edit.setPlainText(content.text)
+        content.grContent = self
+
+    # keeps text typed into recycled widget with content it was typed for
+    def unbind(self):
+        self.content.text = self.text_edit.toPlainText()
+        self.content.grContent = None
+
+
+class TitleEditWidget(QGraphicsTextItem):
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setTextInteractionFlags(Qt.TextInteractionFlag.TextEditorInteraction)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.parentItem().closeTitleEditor()
+        elif event.key() == Qt.Key.Key_Escape:
+            self.parentItem().closeTitleEditor(commit=False)
+        else:
+            super().keyPressEvent(event)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        if self.parentItem() is not None:
+            self.parentItem().closeTitleEditor()
 
 
 class TextEditWidget(QTextEdit):
@@ -231,40 +810,23 @@ class TextEditWidget(QTextEdit):
 
 # ----------------- Socket UI -------------------- #
 
-class SocketPosType:
-    LEFT_TOP = 1
-    LEFT_BOTTOM = 2
-    RIGHT_TOP = 3
-    RIGHT_BOTTOM = 4
-
+class SocketWidget(QGraphicsItem):
 
-class SocketType:
-    DEFAULT = 0
+    cache_kind = "socket"
+    styles = style_registry
+    radius = 9
+    outline_width = 2
 
+    def __init__(self, socket, widget_type=SocketType.DEFAULT, parent=None):
+        super().__init__(parent)
+        self.socket = socket
 
-class SocketWidget(QGraphicsItem):
+        self._pen = self.styles.socketPen(self.outline_width)
+        self._brush = self.styles.socketBrush(widget_type)
 
-    def __init__(self, socket, widget_type=SocketType.DEFAULT):
+    def bind(self, socket):
         self.socket = socket
-        super().__init__(socket.node.grNode)
-
-        self.radius = 9
-        self.outline_width = 2
-
-        self._colors = [
-            QColor("#FFFF7700"),
-            QColor("#FF52e220"),
-            QColor("#FF0056a6"),
-            QColor("#FFa86db1"),
-            QColor("#FFb54747"),
-            QColor("#FFdbe220")
-        ]
-        self._color_background = self._colors[widget_type]
-        self._color_outline = QColor("#FF000000")
-
-        self._pen = QPen(self._color_outline)
-        self._pen.setWidthF(self.outline_width)
-        self._brush = QBrush(self._color_background)
+        self._brush = self.styles.socketBrush(socket.socket_type)
 
     def paint(self, painter, styles, widget=None):
         # painting circle
@@ -280,47 +842,117 @@ class SocketWidget(QGraphicsItem):
             2 * (self.radius + self.outline_width),
         )
 
+
+# stands for socket painted inline by its node, so view picks it like socket widget
+class SocketHandle:
+    __slots__ = ('socket',)
+
+    def __init__(self, socket):
+        self.socket = socket
+
 # ----------------- Edge UI -------------------- #
 
 
-class EdgeType:
-    Direct = 1
-    Bezier = 2
+def createEdgePath(edge, s, d, roundness):
+    path = QPainterPath(QPointF(s[0], s[1]))
+    edge_type = edge.edge_type
 
+    if edge_type == EdgeType.Direct:
+        path.lineTo(d[0], d[1])
 
-class EdgeWidget(QGraphicsPathItem):
+    elif edge_type == EdgeType.Bezier:
 
-    def __init__(self, edge, parent=None):
-        super().__init__(parent)
+        distance = (d[0] - s[0]) * 0.5
+        cpx_s = +distance
+        cpx_d = -distance
+        cpy_s = 0
+        cpy_d = 0
 
-        self.edge = edge
+        if edge.start_socket is not None:
+            sspos = edge.start_socket.position
+
+            if (s[0] > d[0] and sspos in (SocketPosType.RIGHT_TOP, SocketPosType.RIGHT_BOTTOM)) \
+                    or (s[0] < d[0] and sspos in (SocketPosType.LEFT_BOTTOM, SocketPosType.LEFT_TOP)):
+                cpx_d *= -1
+                cpy_d = ((s[1] - d[1]) / math.fabs((s[1] - d[1]) if (s[1] - d[1]) != 0 else 0.00001))
+                cpy_d *= roundness
+
+                cpx_s *= -1
+                cpy_s = ((d[1] - s[1]) / math.fabs((d[1] - s[1]) if (d[1] - s[1]) != 0 else 0.00001))
+                cpy_s *= roundness
+
+        path.cubicTo(
+            s[0] + cpx_s,
+            s[1] + cpy_s,
+            d[0] + cpx_d,
+            d[1] + cpy_d,
+            d[0], d[1]
+        )
+
+    return path
+
+
+# flattened edge path used for exact intersection tests, as array of points
+def flattenEdgePath(path):
+    polygons = path.toSubpathPolygons()
+    if not polygons or polygons[0].isEmpty():
+        return np.empty((0, 2))
+    polygon = polygons[0]
+    # QPolygonF stores points as consecutive pairs of doubles
+    data = polygon.data()
+    data.setsize(polygon.size() * 16)
+    return np.frombuffer(data, dtype=np.float64).reshape(-1, 2).copy()
+
+
+# endpoints of edge and its path, hit shape, bounds and polyline cached until endpoints
+# or edge type change, shared by edge widgets and handles of edge layer
+class EdgePathCache:
+    __slots__ = ()
+
+    # widens edge shape used for hit-testing and selection
+    hit_stroker = QPainterPathStroker()
+    hit_stroker.setWidth(10)
+
+    def _initPath(self):
         self.edgeControlRoundness = 20
 
         self._posSource = [0, 0]
         self._posDest = [200, 100]
 
-        self._color = QColor("#001000")
-        self._pen = QPen(self._color)
-        self._pen.setWidthF(2.0)
+        # cached until source, dest or edge type change
+        self._path = None
+        self._shape = None
+        self._bounds = None
+        self._polyline = None
 
-        self._color_selected = QColor("#00ff00")
-        self._pen_selected = QPen(self._color_selected)
-        self._pen_selected.setWidthF(2.0)
+    def setSource(self, x, y):
+        if self._posSource[0] != x or self._posSource[1] != y:
+            self.invalidatePath()
+            self._posSource = [x, y]
 
-        self._color_dragging = QColor("#ff0000")
-        self._pen_dragging = QPen(self._color_dragging)
-        self._pen_dragging.setWidthF(2.0)
-        self._pen_dragging.setStyle(Qt.DashLine)
+    def setDest(self, x, y):
+        if self._posDest[0] != x or self._posDest[1] != y:
+            self.invalidatePath()
+            self._posDest = [x, y]
 
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
+    def invalidatePath(self):
+        self._path = None
+        self._shape = None
+        self._bounds = None
+        self._polyline = None
 
-        self.setZValue(-1)
+    def getPath(self):
+        if self._path is None:
+            self._path = self._getPath()
+        return self._path
 
-    def setSource(self, x, y):
-        self._posSource = [x, y]
+    def _getPath(self):
+        return createEdgePath(self.edge, self._posSource, self._posDest, self.edgeControlRoundness)
 
-    def setDest(self, x, y):
-        self._posDest = [x, y]
+    def getPolyline(self):
+        if self._polyline is None:
+            self._polyline = flattenEdgePath(self.getPath())
+        return self._polyline
 
     @property
     def posSource(self):
@@ -330,106 +962,153 @@ class EdgeWidget(QGraphicsPathItem):
     def posDest(self):
         return self._posDest
 
-    def paint(self, painter, option, widget):
-        self.setPath(self._getPath())
+    def intersectsWith(self, p1, p2):
+        if not self.boundingRect().intersects(QRectF(p1, p2).normalized().adjusted(-1, -1, 1, 1)):
+            return False
+        return polylineIntersectsSegment(self.getPolyline(), p1.x(), p1.y(), p2.x(), p2.y())
 
-        if self.edge.end_socket is None:
-            painter.setPen(self._pen_dragging)
-        else:
-            painter.setPen(self._pen_selected if self.isSelected() else self._pen)
+    def boundingRect(self):
+        if self._bounds is None:
+            self._bounds = self.shape().boundingRect()
+        return self._bounds
 
-        painter.setBrush(Qt.NoBrush)
-        painter.drawPath(self.path())
+    def shape(self):
+        if self._shape is None:
+            self._shape = self.hit_stroker.createStroke(self.getPath())
+        return self._shape
 
-    def _getPath(self):
-        s = self._posSource
-        d = self._posDest
-        path = QPainterPath(QPointF(s[0], s[1]))
-        edge_type = self.edge.edge_type
 
-        if edge_type == EdgeType.Direct:
-            path.lineTo(d[0], d[1])
+class EdgeWidget(EdgePathCache, QGraphicsPathItem):
 
-        elif edge_type == EdgeType.Bezier:
+    styles = style_registry
+    cache_kind = "edge"
 
-            distance = (d[0] - s[0]) * 0.5
-            cpx_s = +distance
-            cpx_d = -distance
-            cpy_s = 0
-            cpy_d = 0
+    def __init__(self, edge, parent=None):
+        super().__init__(parent)
 
-            if self.edge.start_socket is not None:
-                sspos = self.edge.start_socket.position
+        self.edge = edge
+        self._initPath()
 
-                if (s[0] > d[0] and sspos in (SocketPosType.RIGHT_TOP, SocketPosType.RIGHT_BOTTOM)) \
-                        or (s[0] < d[0] and sspos in (SocketPosType.LEFT_BOTTOM, SocketPosType.LEFT_TOP)):
-                    cpx_d *= -1
-                    cpy_d = ((s[1] - d[1]) / math.fabs((s[1] - d[1]) if (s[1] - d[1]) != 0 else 0.00001))
-                    cpy_d *= self.edgeControlRoundness
+        self._pen = self.styles.pen("edge", 2.0)
+        self._pen_selected = self.styles.pen("edge.selected", 2.0)
+        self._pen_dragging = self.styles.pen("edge.dragging", 2.0, Qt.DashLine)
 
-                    cpx_s *= -1
-                    cpy_s = ((d[1] - s[1]) / math.fabs((d[1] - s[1]) if (d[1] - s[1]) != 0 else 0.00001))
-                    cpy_s *= self.edgeControlRoundness
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
 
-            path.cubicTo(
-                s[0] + cpx_s,
-                s[1] + cpy_s,
-                d[0] + cpx_d,
-                d[1] + cpy_d,
-                d[0], d[1]
-            )
+        self.setZValue(-1)
 
-        return path
+    def invalidatePath(self):
+        self.prepareGeometryChange()
+        super().invalidatePath()
 
-    def intersectsWith(self, p1, p2):
-        cutpath = QPainterPath(p1)
-        cutpath.lineTo(p2)
-        path = self._getPath()
-        return cutpath.intersects(path)
+    def paint(self, painter, option, widget):
+        if self.edge.end_socket is None:
+            painter.setPen(self._pen_dragging)
+        else:
+            painter.setPen(self._pen_selected if self.isSelected() else self._pen)
 
-    def boundingRect(self):
-        return self.shape().boundingRect()
+        painter.setBrush(Qt.NoBrush)
+        if self.scene().detail_level >= DetailLevel.LOW:
+            painter.drawLine(QPointF(*self._posSource), QPointF(*self._posDest))
+        else:
+            painter.drawPath(self.getPath())
 
-    def shape(self):
-        return self._getPath()
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            # Qt deselects hidden widgets, their edges stay selected
+            if value or self.isVisible():
+                self.edge.scene.selection.setEdgeSelected(self.edge, bool(value))
+        return super().itemChange(change, value)
 
 # ----------------- CutLine UI -------------------- #
 
 
 class CutLineWidget(QGraphicsItem):
 
+    styles = style_registry
+
+    # points drawn by single polyline, exposed parts of long cut line are repainted by chunks
+    chunk_size = 64
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.line_points = []
+        # bounds grow by margin at once, so that index isn't updated on every appended point
+        self.bounds_margin = 64
+
+        self._pen = self.styles.pen("cutline", 2.0, dashes=(3, 3))
 
-        self._pen = QPen(Qt.white)
-        self._pen.setWidthF(2.0)
-        self._pen.setDashPattern([3, 3])
+        # kept in sync with line_points by addPoint and clear
+        self._path = QPainterPath()
+        self._chunks = []
+        self._length = 0.0
+        self._bounds = QRectF()
 
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
         self.setZValue(2)
 
+    # appends point, unless it's closer than min_distance to last point, returns whether it was added
+    def addPoint(self, point, min_distance=0.0):
+        point = QPointF(point)
+        if not self.line_points:
+            self._path.moveTo(point)
+            self._grow(point)
+            self.line_points.append(point)
+            return True
+
+        last = self.line_points[-1]
+        length = math.hypot(point.x() - last.x(), point.y() - last.y())
+        if length < min_distance:
+            return False
+
+        if not self._chunks or self._chunks[-1][0].size() > self.chunk_size:
+            # chunk starts at last point of previous one, dashes continue at its length
+            self._chunks.append([QPolygonF([last]), QRectF(last, last), self._length])
+        chunk = self._chunks[-1]
+        chunk[0].append(point)
+        chunk[1] = chunk[1].united(QRectF(last, point).normalized())
+        self._length += length
+        self._path.lineTo(point)
+        self._grow(point)
+        self.line_points.append(point)
+
+        width = self._pen.widthF()
+        self.update(QRectF(last, point).normalized().adjusted(-width, -width, width, width))
+        return True
+
+    def _grow(self, point):
+        if self._bounds.contains(point):
+            return
+        margin = self.bounds_margin
+        self.prepareGeometryChange()
+        rect = QRectF(point.x() - margin, point.y() - margin, 2 * margin, 2 * margin)
+        self._bounds = self._bounds.united(rect) if not self._bounds.isNull() else rect
+
+    def clear(self):
+        self.prepareGeometryChange()
+        self.line_points = []
+        self._path = QPainterPath()
+        self._chunks = []
+        self._length = 0.0
+        self._bounds = QRectF()
+
     def boundingRect(self):
-        return self.shape().boundingRect()
+        return self._bounds
 
     def shape(self):
-        path = None
-        poly = QPolygonF(self.line_points)
+        return self._path
 
-        if len(self.line_points) > 1:
-            path = QPainterPath(self.line_points[0])
-            for pt in self.line_points[1:]:
-                path.lineTo(pt)
-        else:
-            path = QPainterPath(QPointF(0, 0))
-            path.lineTo(QPointF(1, 1))
-
-        return path
-
-    def paint(self, painter, options, widget=None):
+    def paint(self, painter, option, widget=None):
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setBrush(Qt.NoBrush)
-        painter.setPen(self._pen)
 
-        poly = QPolygonF(self.line_points)
-        painter.drawPolyline(poly)
\ No newline at end of file
+        pen = QPen(self._pen)
+        width = pen.widthF()
+        for polygon, bounds, offset in self._chunks:
+            # bounds of straight chunk can have zero width or height
+            if bounds.adjusted(-width, -width, width, width).intersects(option.exposedRect):
+                # dash offset is in units of pen width
+                pen.setDashOffset(offset / width)
+                painter.setPen(pen)
+                painter.drawPolyline(polygon)
\ No newline at end of file
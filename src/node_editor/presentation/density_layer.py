@@ -0,0 +1,162 @@
+import math
+
+import numpy as np
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QGraphicsItem
+
+from src.node_editor.presentation.style import style_registry
+
+
+# density heatmap of nodes, shown instead of node and edge widgets when zoomed far out,
+# node counts are binned by node center into cells of cell_size and kept in sync incrementally,
+# heatmap is painted as single image with one pixel per cell
+class DensityLayer(QGraphicsItem):
+
+    styles = style_registry
+
+    def __init__(self, cell_size=256, saturation=16, parent=None):
+        super().__init__(parent)
+
+        self.cell_size = cell_size
+        # count of nodes in cell painted with full opacity
+        self.saturation = saturation
+
+        self._cells = {}
+        self._counts = {}
+        # covered cells (left, top, right, bottom), grows with nodes and shrinks on rebuild
+        self._extent = None
+        self._bounds = QRectF()
+        self._image = None
+        self._image_color = None
+
+        self.setZValue(-1)
+        self.setVisible(False)
+
+    def __len__(self):
+        return len(self._cells)
+
+    def countAt(self, x, y):
+        return self._counts.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)), 0)
+
+    def _cellOf(self, node):
+        x, y = node.pos
+        size = self.cell_size
+        return math.floor((x + node.width / 2) / size), math.floor((y + node.height / 2) / size)
+
+    # bins all nodes of geometry store at once
+    def rebuild(self, geometry):
+        slots = geometry.alive()
+        size = self.cell_size
+        columns = np.floor((geometry.x[slots] + geometry.w[slots] / 2) / size).astype(np.int64)
+        rows = np.floor((geometry.y[slots] + geometry.h[slots] / 2) / size).astype(np.int64)
+        cells = list(zip(columns.tolist(), rows.tolist()))
+        self._cells = dict(zip(geometry.getItems(slots), cells))
+        self._counts = {}
+        for cell in cells:
+            self._counts[cell] = self._counts.get(cell, 0) + 1
+        extent = None
+        if cells:
+            extent = (int(columns.min()), int(rows.min()), int(columns.max()), int(rows.max()))
+        self._setExtent(extent)
+
+    def addNodes(self, nodes):
+        for node in nodes:
+            cell = self._cellOf(node)
+            self._cells[node] = cell
+            self._addToCell(cell, 1)
+
+    def removeNode(self, node):
+        cell = self._cells.pop(node, None)
+        if cell is not None:
+            self._addToCell(cell, -1)
+
+    def moveNodes(self, nodes):
+        cells = self._cells
+        for node in nodes:
+            previous = cells.get(node)
+            if previous is None:
+                continue
+            cell = self._cellOf(node)
+            if cell != previous:
+                cells[node] = cell
+                self._addToCell(previous, -1)
+                self._addToCell(cell, 1)
+
+    def _addToCell(self, cell, delta):
+        count = self._counts.get(cell, 0) + delta
+        if count > 0:
+            self._counts[cell] = count
+        else:
+            self._counts.pop(cell, None)
+
+        extent = self._extent
+        i, j = cell
+        if extent is None or not (extent[0] <= i <= extent[2] and extent[1] <= j <= extent[3]):
+            if extent is None:
+                extent = (i, j, i, j)
+            self._setExtent((min(extent[0], i), min(extent[1], j), max(extent[2], i), max(extent[3], j)))
+            return
+        if self._image is not None:
+            self._image.setPixel(i - extent[0], j - extent[1], self._pixel(count, self._image_color))
+        if self.isVisible():
+            size = self.cell_size
+            self.update(i * size, j * size, size, size)
+
+    def _setExtent(self, extent):
+        self.prepareGeometryChange()
+        self._extent = extent
+        self._image = None
+        if extent is None:
+            self._bounds = QRectF()
+        else:
+            size = self.cell_size
+            left, top, right, bottom = extent
+            self._bounds = QRectF(left * size, top * size, (right - left + 1) * size, (bottom - top + 1) * size)
+        self.update()
+
+    def _alpha(self, counts):
+        return np.minimum(np.log1p(counts) / math.log1p(self.saturation), 1.0)
+
+    def _pixel(self, count, rgba):
+        if count <= 0:
+            return 0
+        alpha = float(self._alpha(count))
+        r, g, b, a = rgba
+        a = a * alpha
+        return (int(a) << 24) | (int(r * a / 255) << 16) | (int(g * a / 255) << 8) | int(b * a / 255)
+
+    def _renderImage(self):
+        left, top, right, bottom = self._extent
+        width, height = right - left + 1, bottom - top + 1
+        color = self.styles.color("density")
+        rgba = color.getRgb()
+        self._image_color = rgba
+
+        counts = np.zeros((height, width), dtype=np.float64)
+        if self._counts:
+            cells = np.array(list(self._counts), dtype=np.int64)
+            counts[cells[:, 1] - top, cells[:, 0] - left] = list(self._counts.values())
+        a = rgba[3] * self._alpha(counts) * (counts > 0)
+        pixels = (
+            (a.astype(np.uint32) << 24) |
+            ((rgba[0] * a / 255).astype(np.uint32) << 16) |
+            ((rgba[1] * a / 255).astype(np.uint32) << 8) |
+            (rgba[2] * a / 255).astype(np.uint32)
+        )
+        pixels = np.ascontiguousarray(pixels)
+        image = QImage(pixels.data, width, height, 4 * width, QImage.Format.Format_ARGB32_Premultiplied)
+        # image doesn't own numpy buffer
+        self._image = image.copy()
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget=None):
+        if self._extent is None:
+            return
+        # theme could change since image was rendered
+        if self._image is None or self._image_color != self.styles.color("density").getRgb():
+            self._renderImage()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        painter.drawImage(self._bounds, self._image)
@@ -0,0 +1,163 @@
+import math
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainterPath
+
+
+# builds shared path of edges with similar endpoints, edges fan in from their sources to trunk,
+# which then fans out to their destinations, sockets shared by several edges are drawn once
+def createBundlePath(segments):
+    count = len(segments)
+    csx = sum(s[0] for s in segments) / count
+    csy = sum(s[1] for s in segments) / count
+    cdx = sum(s[2] for s in segments) / count
+    cdy = sum(s[3] for s in segments) / count
+    tsx, tsy = csx + (cdx - csx) * 0.2, csy + (cdy - csy) * 0.2
+    tdx, tdy = csx + (cdx - csx) * 0.8, csy + (cdy - csy) * 0.8
+
+    path = QPainterPath()
+
+    def curve(x0, y0, x1, y1):
+        distance = math.fabs(x1 - x0) * 0.5
+        path.moveTo(x0, y0)
+        path.cubicTo(x0 + distance, y0, x1 - distance, y1, x1, y1)
+
+    curve(tsx, tsy, tdx, tdy)
+    for x, y in {(s[0], s[1]) for s in segments}:
+        curve(x, y, tsx, tsy)
+    for x, y in {(s[2], s[3]) for s in segments}:
+        curve(tdx, tdy, x, y)
+    return path
+
+
+class BundleSignals(QObject):
+    finished = pyqtSignal(object)
+
+
+# computes bundle paths of given groups in thread pool, result maps group key to (path, bounds)
+class BundleTask(QRunnable):
+
+    def __init__(self, groups):
+        super().__init__()
+        self.groups = groups
+        self.signals = BundleSignals()
+
+    def run(self):
+        bundles = {}
+        for key, segments in self.groups.items():
+            path = createBundlePath(segments)
+            bundles[key] = (path, path.controlPointRect())
+        self.signals.finished.emit(bundles)
+
+
+# groups edges of edge layer by cells of their endpoints and keeps bundle path of every group
+# with at least min_size edges, paths of groups changed by moves are recomputed in background,
+# until then edges of those groups are drawn on their own
+class EdgeBundler:
+
+    def __init__(self, layer, cell_size=320, min_size=2, pool=None):
+        self.layer = layer
+        self.cell_size = cell_size
+        self.min_size = min_size
+        self.pool = pool if pool is not None else QThreadPool.globalInstance()
+
+        self._keys = {}
+        self._segments = {}
+        self._groups = {}
+        self._bundles = {}
+        self._dirty = set()
+        self._task = None
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start)
+
+    def __len__(self):
+        return len(self._bundles)
+
+    @property
+    def busy(self):
+        return self._task is not None or self._timer.isActive()
+
+    def _keyOf(self, segment):
+        size = self.cell_size
+        return tuple(math.floor(value / size) for value in segment)
+
+    # returns path shared by handle's bundle, or None, if handle has to be drawn on its own
+    def bundleOf(self, handle):
+        key = self._keys.get(handle)
+        if key is None:
+            return None
+        bundle = self._bundles.get(key)
+        return bundle[0] if bundle is not None else None
+
+    def updateHandle(self, handle):
+        segment = (*handle.posSource, *handle.posDest)
+        if self._segments.get(handle) == segment:
+            return
+        # edges being dragged aren't bundled
+        key = self._keyOf(segment) if handle.edge.end_socket is not None else None
+        previous = self._keys.get(handle)
+        if previous is not None and previous != key:
+            self._discard(handle, previous)
+        if key is not None:
+            self._keys[handle] = key
+            self._segments[handle] = segment
+            self._groups.setdefault(key, set()).add(handle)
+            self._invalidate(key)
+
+    def removeHandle(self, handle):
+        key = self._keys.get(handle)
+        if key is not None:
+            self._discard(handle, key)
+
+    def _discard(self, handle, key):
+        del self._keys[handle]
+        del self._segments[handle]
+        group = self._groups[key]
+        group.discard(handle)
+        if not group:
+            del self._groups[key]
+        self._invalidate(key)
+
+    def _invalidate(self, key):
+        bundle = self._bundles.pop(key, None)
+        if bundle is not None:
+            self.layer.update(bundle[1])
+        self._dirty.add(key)
+        if self._task is None and not self._timer.isActive():
+            # changes of single event loop pass are computed together
+            self._timer.start(0)
+
+    def _start(self):
+        groups = {}
+        for key in self._dirty:
+            group = self._groups.get(key)
+            if group is not None and len(group) >= self.min_size:
+                groups[key] = [self._segments[handle] for handle in group]
+        self._dirty = set()
+        if not groups:
+            return
+        self._task = BundleTask(groups)
+        self._task.signals.finished.connect(self._onFinished)
+        self.pool.start(self._task)
+
+    def _onFinished(self, bundles):
+        self._task = None
+        for key, (path, bounds) in bundles.items():
+            # group changed again, while its path was computed
+            if key in self._dirty or key not in self._groups:
+                continue
+            self._bundles[key] = (path, bounds)
+            self.layer.updateBounds(bounds)
+        if self._dirty:
+            self._start()
+
+    def clear(self):
+        for path, bounds in self._bundles.values():
+            self.layer.update(bounds)
+        self._keys.clear()
+        self._segments.clear()
+        self._groups.clear()
+        self._bundles.clear()
+        self._dirty.clear()
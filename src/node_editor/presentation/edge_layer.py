@@ -0,0 +1,217 @@
+from PyQt5.QtCore import Qt, QRectF, QPointF, QLineF
+from PyQt5.QtWidgets import QGraphicsItem
+
+from src.core.spatial import SpatialGrid
+from src.node_editor.presentation.edge_bundling import EdgeBundler
+from src.node_editor.presentation.components import DetailLevel, EdgePathCache
+from src.node_editor.presentation.style import style_registry
+
+
+# lightweight stand-in of EdgeWidget for edges drawn by EdgeLayer
+class EdgeHandle(EdgePathCache):
+    __slots__ = ('layer', 'edge', 'edgeControlRoundness', '_posSource', '_posDest',
+                 '_path', '_shape', '_bounds', '_polyline', '_selected')
+
+    def __init__(self, layer, edge):
+        self.layer = layer
+        self.edge = edge
+        self._initPath()
+        self._selected = False
+
+    def invalidatePath(self):
+        if self._bounds is not None:
+            self.layer.update(self._bounds)
+        super().invalidatePath()
+
+    # reindexes edge with its current path and repaints it
+    def update(self):
+        self.layer.updateHandle(self)
+
+    @property
+    def selected(self):
+        return self._selected
+
+    @selected.setter
+    def selected(self, value):
+        self.setSelected(value)
+
+    def isSelected(self):
+        return self._selected
+
+    def setSelected(self, selected):
+        self.layer.setHandleSelected(self, selected)
+
+
+# draws all edges of scene through single item, edges are grouped by pen
+# and only those found by spatial index in exposed rect are painted
+class EdgeLayer(QGraphicsItem):
+
+    styles = style_registry
+
+    def __init__(self, cell_size=256, parent=None):
+        super().__init__(parent)
+
+        self.index = SpatialGrid(cell_size)
+        self._handles = set()
+        self._selected = {}
+        self._bounds = QRectF()
+        # optional bundling of edges with similar endpoints
+        self.bundler = None
+
+        self._pen = self.styles.pen("edge", 2.0)
+        self._pen_selected = self.styles.pen("edge.selected", 2.0)
+        self._pen_dragging = self.styles.pen("edge.dragging", 2.0, Qt.DashLine)
+
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+        self.setZValue(-1)
+
+    def __len__(self):
+        return len(self._handles)
+
+    def setBundling(self, enabled, **options):
+        if self.bundler is not None:
+            self.bundler.clear()
+            self.bundler = None
+        if enabled:
+            self.bundler = EdgeBundler(self, **options)
+            for handle in self._handles:
+                if handle in self.index:
+                    self.bundler.updateHandle(handle)
+        self.update()
+
+    def addEdge(self, edge):
+        handle = EdgeHandle(self, edge)
+        self._handles.add(handle)
+        return handle
+
+    def removeEdge(self, edge):
+        handle = edge.grEdge
+        self._handles.discard(handle)
+        self._selected.pop(handle, None)
+        self.index.remove(handle)
+        if self.bundler is not None:
+            self.bundler.removeHandle(handle)
+        handle.invalidatePath()
+
+    def updateHandle(self, handle):
+        if handle not in self._handles:
+            return
+        bounds = handle.boundingRect()
+        self.index.insert(handle, bounds.left(), bounds.top(), bounds.right(), bounds.bottom())
+        if self.bundler is not None:
+            self.bundler.updateHandle(handle)
+        self.updateBounds(bounds)
+
+    # grows layer to cover given scene rect and repaints it
+    def updateBounds(self, bounds):
+        if not self._bounds.contains(bounds):
+            self.prepareGeometryChange()
+            self._bounds = self._bounds.united(bounds)
+        self.update(bounds)
+
+    # picking
+
+    def getHandlesIn(self, rect):
+        return self.index.query(rect.left(), rect.top(), rect.right(), rect.bottom())
+
+    def edgeAt(self, pos):
+        x, y = pos.x(), pos.y()
+        found = None
+        for handle in self.index.query(x, y, x, y):
+            if handle.boundingRect().contains(pos) and handle.shape().contains(pos):
+                # selected edge wins, so it can be dragged or deselected
+                if handle._selected:
+                    return handle
+                found = handle
+        return found
+
+    # selection
+
+    def getSelectedEdges(self):
+        return [handle.edge for handle in self._selected]
+
+    def setHandleSelected(self, handle, selected):
+        if selected == handle._selected:
+            return
+        handle._selected = selected
+        if selected:
+            self._selected[handle] = None
+        else:
+            self._selected.pop(handle, None)
+        handle.edge.scene.selection.setEdgeSelected(handle.edge, selected)
+        self.update(handle.boundingRect())
+
+    def clearSelection(self):
+        for handle in tuple(self._selected):
+            self.setHandleSelected(handle, False)
+
+    # selects edges, whose hit shapes intersect given scene rect
+    def setSelectionRect(self, rect, add=False):
+        selected = {
+            handle for handle in self.getHandlesIn(rect)
+            if handle.boundingRect().intersects(rect) and handle.shape().intersects(rect)
+        }
+        if not add:
+            for handle in tuple(self._selected):
+                if handle not in selected:
+                    self.setHandleSelected(handle, False)
+        for handle in selected:
+            self.setHandleSelected(handle, True)
+
+    def mousePressEvent(self, event):
+        handle = self.edgeAt(event.scenePos())
+        if handle is None or event.button() != Qt.LeftButton:
+            event.ignore()
+            return
+        if event.modifiers() & Qt.ControlModifier:
+            handle.setSelected(not handle._selected)
+        else:
+            # scene selection also holds nodes without shown widget
+            handle.edge.scene.selection.clear()
+            self.scene().clearSelection()
+            self.clearSelection()
+            handle.setSelected(True)
+        event.accept()
+
+    # item
+
+    def contains(self, point):
+        return self.edgeAt(point) is not None
+
+    def boundingRect(self):
+        return self._bounds
+
+    def paint(self, painter, option, widget=None):
+        handles = self.getHandlesIn(option.exposedRect)
+        if not handles:
+            return
+        default, selected, dragging = [], [], []
+        bundles = {}
+        bundler = self.bundler
+        for handle in handles:
+            if handle.edge.end_socket is None:
+                dragging.append(handle)
+            elif handle._selected:
+                selected.append(handle)
+            else:
+                path = bundler.bundleOf(handle) if bundler is not None else None
+                if path is not None:
+                    bundles[id(path)] = path
+                else:
+                    default.append(handle)
+
+        painter.setBrush(Qt.NoBrush)
+        low = self.scene().detail_level >= DetailLevel.LOW
+        if bundles:
+            painter.setPen(self._pen)
+            for path in bundles.values():
+                painter.drawPath(path)
+        for pen, group in ((self._pen, default), (self._pen_selected, selected), (self._pen_dragging, dragging)):
+            if not group:
+                continue
+            painter.setPen(pen)
+            if low:
+                painter.drawLines([QLineF(QPointF(*h._posSource), QPointF(*h._posDest)) for h in group])
+            else:
+                for handle in group:
+                    painter.drawPath(handle.getPath())
@@ -0,0 +1,63 @@
+import time
+
+from PyQt5.QtCore import QTimer
+
+
+# collects nodes moved by interaction and brings their presentation and edges up to date
+# at most once per frame interval, node moved several times within frame is updated once
+class FrameScheduler:
+
+    def __init__(self, grScene, interval=16):
+        self.grScene = grScene
+        self.interval = interval
+        self._nodes = {}
+        # end of last flush, so that flush slower than interval still leaves whole interval to coalesce
+        self._flushed = 0.0
+
+        # ticks once per interval while changes are pending
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def setInterval(self, interval):
+        self.interval = interval
+        if self._timer.isActive():
+            self._timer.start(self._remaining())
+
+    # only marks node dirty, changes are applied by next tick or at end of mouse event
+    def scheduleNode(self, node):
+        self._nodes[node] = None
+        if not self._timer.isActive():
+            self._timer.start(self._remaining())
+
+    def _remaining(self):
+        elapsed = (time.perf_counter() - self._flushed) * 1000
+        return max(0, int(self.interval - elapsed))
+
+    # called by view after it has handled mouse event, flushing within event, which changed items,
+    # lets scene index them in single pass, changes deferred to timer would be indexed again while painting
+    def flushIfDue(self):
+        if self._nodes and self._remaining() == 0:
+            self.flush()
+
+    # applies pending changes now, e.g. before interaction ends
+    def flush(self):
+        self._timer.stop()
+        scene = self.grScene.scene
+        nodes = [node for node in self._nodes if node in scene.nodes]
+        self._nodes = {}
+
+        if self.grScene.density_layer is not None:
+            self.grScene.density_layer.moveNodes(nodes)
+        # edge between two moved nodes is updated once
+        edges = {}
+        for node in nodes:
+            for socket in node.inputs + node.outputs:
+                edges.update(dict.fromkeys(socket.edges))
+        for edge in edges:
+            if edge in scene.edges:
+                edge.updatePositions()
+        self._flushed = time.perf_counter()
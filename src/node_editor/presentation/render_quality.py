@@ -0,0 +1,108 @@
+import time
+from collections import deque
+
+from PyQt5.QtCore import QTimer, QRectF
+from PyQt5.QtGui import QPainter
+from PyQt5.QtWidgets import QGraphicsView
+
+
+# drops view to cheap render hints while user pans, zooms or drags
+# and restores high quality, once view stays idle for idle_delay ms
+class RenderQuality:
+
+    HIGH_HINTS = (
+        QPainter.Antialiasing |
+        QPainter.HighQualityAntialiasing |
+        QPainter.TextAntialiasing |
+        QPainter.SmoothPixmapTransform
+    )
+    LOW_HINTS = QPainter.TextAntialiasing
+
+    def __init__(self, update_mode=QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate,
+                 high_hints=HIGH_HINTS, low_hints=LOW_HINTS, idle_delay=150, frames=120):
+        self.view = None
+        self.update_mode = update_mode
+        self.high_hints = high_hints
+        self.low_hints = low_hints
+        self.idle_delay = idle_delay
+        self.interacting = False
+        # scene area shown while interacting, items painted there used cheap hints
+        self.interaction_rect = QRectF()
+        self._idle_listeners = []
+        self._idle_timer = None
+
+        self._frame_times = deque(maxlen=frames)
+        self._frame_start = 0.0
+
+    # binds settings to view, which is then rendered with them
+    def attach(self, view):
+        if self._idle_timer is not None:
+            self._idle_timer.stop()
+            self._idle_timer.deleteLater()
+        self.view = view
+        self.interacting = False
+        self._idle_timer = QTimer(view)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.idle_delay)
+        self._idle_timer.timeout.connect(self._onIdle)
+        self.apply()
+
+    def apply(self):
+        self.view.setViewportUpdateMode(self.update_mode)
+        self.view.setRenderHints(self.low_hints if self.interacting else self.high_hints)
+
+    def setIdleDelay(self, delay):
+        self.idle_delay = delay
+        if self._idle_timer is not None:
+            self._idle_timer.setInterval(delay)
+
+    # listener is called with interaction rect, once high quality is restored
+    def observeIdle(self, listener):
+        self._idle_listeners.append(listener)
+
+    def removeIdleObserver(self, listener):
+        self._idle_listeners.remove(listener)
+
+    # marks single interaction step, like wheel zoom or mouse drag move
+    def interact(self):
+        if not self.interacting:
+            self.interacting = True
+            self.interaction_rect = QRectF()
+            self.view.setRenderHints(self.low_hints)
+        self._idle_timer.start()
+        self._extendInteractionRect()
+
+    def _extendInteractionRect(self):
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        self.interaction_rect = self.interaction_rect.united(rect)
+
+    def _onIdle(self):
+        self.interacting = False
+        self.view.setRenderHints(self.high_hints)
+        # view could be moved by last interaction step after it was reported
+        self._extendInteractionRect()
+        for listener in self._idle_listeners:
+            listener(self.interaction_rect)
+        self.view.viewport().update()
+
+    # frame-time counter
+
+    def beginFrame(self):
+        self._frame_start = time.perf_counter()
+
+    def endFrame(self):
+        self._frame_times.append(time.perf_counter() - self._frame_start)
+
+    @property
+    def frameTime(self):
+        # average of last frames in ms
+        if not self._frame_times:
+            return 0.0
+        return 1000 * sum(self._frame_times) / len(self._frame_times)
+
+    @property
+    def lastFrameTime(self):
+        return 1000 * self._frame_times[-1] if self._frame_times else 0.0
+
+    def resetFrames(self):
+        self._frame_times.clear()
@@ -0,0 +1,125 @@
+import weakref
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPen, QBrush, QFont
+
+
+DARK_THEME = {
+    "scene.background": "#393939",
+    "scene.grid.light": "#2f2f2f",
+    "scene.grid.dark": "#292929",
+    "node.outline": "#7F000000",
+    "node.outline.selected": "#FFFFA637",
+    "node.title": "#FF313131",
+    "node.title.text": "#FFFFFFFF",
+    "node.background": "#E3212121",
+    "socket.outline": "#FF000000",
+    "socket.0": "#FFFF7700",
+    "socket.1": "#FF52e220",
+    "socket.2": "#FF0056a6",
+    "socket.3": "#FFa86db1",
+    "socket.4": "#FFb54747",
+    "socket.5": "#FFdbe220",
+    "edge": "#001000",
+    "edge.selected": "#00ff00",
+    "edge.dragging": "#ff0000",
+    "cutline": "#FFFFFFFF",
+    "density": "#FFFFA637",
+    "font.title": ("Ubuntu", 10),
+}
+
+LIGHT_THEME = dict(
+    DARK_THEME,
+    **{
+        "scene.background": "#e8e8e8",
+        "scene.grid.light": "#dcdcdc",
+        "scene.grid.dark": "#c8c8c8",
+        "node.outline": "#7F000000",
+        "node.title": "#FF9a9a9a",
+        "node.title.text": "#FF000000",
+        "node.background": "#E3f4f4f4",
+        "edge": "#303030",
+        "edge.selected": "#008f00",
+        "cutline": "#FF000000",
+        "density": "#FF0056a6",
+    }
+)
+
+
+# hands out pens, brushes and fonts shared by all presentation items,
+# items must treat them as immutable, only setTheme recolors them in place
+class StyleRegistry:
+
+    def __init__(self, theme=DARK_THEME):
+        self.theme = dict(theme)
+        self._colors = {}
+        self._pens = {}
+        self._brushes = {}
+        self._fonts = {}
+        # held weakly, registry is shared by all scenes and mustn't keep closed ones alive
+        self._theme_listeners = []
+
+    def color(self, role):
+        color = self._colors.get(role)
+        if color is None:
+            color = self._colors[role] = QColor(self.theme[role])
+        return color
+
+    def pen(self, role, width=1.0, style=Qt.PenStyle.SolidLine, dashes=None):
+        key = (role, width, style, dashes)
+        pen = self._pens.get(key)
+        if pen is None:
+            pen = QPen(self.color(role))
+            pen.setWidthF(width)
+            pen.setStyle(style)
+            if dashes is not None:
+                pen.setDashPattern(list(dashes))
+            self._pens[key] = pen
+        return pen
+
+    def brush(self, role):
+        brush = self._brushes.get(role)
+        if brush is None:
+            brush = self._brushes[role] = QBrush(self.color(role))
+        return brush
+
+    def font(self, role):
+        font = self._fonts.get(role)
+        if font is None:
+            font = self._fonts[role] = QFont(*self.theme[role])
+        return font
+
+    def socketBrush(self, socket_type):
+        return self.brush("socket.%d" % socket_type)
+
+    def socketPen(self, width):
+        return self.pen("socket.outline", width)
+
+    # bound method listener is called once theme has changed, e.g. to restyle what holds own copies
+    def observeTheme(self, listener):
+        self._theme_listeners.append(weakref.WeakMethod(listener))
+
+    def removeThemeObserver(self, listener):
+        self._theme_listeners = [ref for ref in self._theme_listeners if ref() not in (None, listener)]
+
+    # recolors every handed out object, so items pick up new theme on next paint
+    def setTheme(self, theme):
+        self.theme = dict(theme)
+        for role, color in self._colors.items():
+            color.setNamedColor(self.theme[role])
+        for (role, *_), pen in self._pens.items():
+            pen.setColor(self._colors[role])
+        for role, brush in self._brushes.items():
+            brush.setColor(self._colors[role])
+        for role, font in self._fonts.items():
+            family, size = self.theme[role]
+            font.setFamily(family)
+            font.setPointSize(size)
+        self._theme_listeners = [ref for ref in self._theme_listeners if ref() is not None]
+        for ref in tuple(self._theme_listeners):
+            listener = ref()
+            if listener is not None:
+                listener()
+
+
+style_registry = StyleRegistry()
@@ -0,0 +1,135 @@
+import math
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QRectF, QTimer
+from PyQt5.QtGui import QPainter, QPixmap
+
+
+# pre-renders scene into pixmap tiles of tile_size device pixels per zoom level,
+# tiles touched by scene changes are dropped and rendered again when needed
+class TileCache:
+
+    def __init__(self, view, tile_size=256, limit=192, frame_budget=4, hints=None):
+        self.view = view
+        self.tile_size = tile_size
+        self.limit = limit
+        # tiles rendered while painting single frame, missing rest falls back to regular painting
+        self.frame_budget = frame_budget
+        self.hints = hints if hints is not None else view.renderQuality.high_hints
+
+        self._tiles = OrderedDict()
+        self._pending = []
+        self._prefetch_timer = QTimer(view)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._prefetchStep)
+
+        view.scene.grScene.changed.connect(self.invalidate)
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def detach(self):
+        self.view.scene.grScene.changed.disconnect(self.invalidate)
+        self._prefetch_timer.stop()
+        self.clear()
+
+    def clear(self):
+        self._tiles.clear()
+        self._pending.clear()
+
+    # tiles are aligned to device pixels, so only scale and integer offset of view matter
+    def _level(self):
+        transform = self.view.viewportTransform()
+        if transform.m12() != 0 or transform.m21() != 0 or transform.m11() != transform.m22():
+            return None
+        return transform.m11(), round(transform.dx()), round(transform.dy())
+
+    def sceneMargin(self):
+        level = self._level()
+        return self.tile_size / level[0] if level is not None else 0
+
+    def _tileRect(self, scale, ix, iy):
+        size = self.tile_size / scale
+        return QRectF(ix * size, iy * size, size, size)
+
+    def _keysIn(self, scale, rect):
+        size = self.tile_size / scale
+        return [
+            (scale, ix, iy)
+            for iy in range(math.floor(rect.top() / size), math.floor(rect.bottom() / size) + 1)
+            for ix in range(math.floor(rect.left() / size), math.floor(rect.right() / size) + 1)
+        ]
+
+    def _render(self, key):
+        scale, ix, iy = key
+        pixmap = QPixmap(self.tile_size, self.tile_size)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHints(self.hints)
+        target = QRectF(0, 0, self.tile_size, self.tile_size)
+        self.view.scene.grScene.render(painter, target, self._tileRect(scale, ix, iy), Qt.AspectRatioMode.IgnoreAspectRatio)
+        painter.end()
+        self._tiles[key] = pixmap
+        while len(self._tiles) > self.limit:
+            self._tiles.popitem(last=False)
+        return pixmap
+
+    # paints exposed device rect from tiles, returns False when caller has to paint it regularly
+    def paint(self, exposed):
+        level = self._level()
+        if level is None:
+            return False
+        scale, dx, dy = level
+        size = self.tile_size
+        rect = QRectF(exposed).translated(-dx, -dy)
+        keys = [
+            (scale, ix, iy)
+            for iy in range(math.floor(rect.top() / size), math.floor(rect.bottom() / size) + 1)
+            for ix in range(math.floor(rect.left() / size), math.floor(rect.right() / size) + 1)
+        ]
+        missing = [key for key in keys if key not in self._tiles]
+        if len(missing) > self.frame_budget:
+            self._schedule(missing)
+            return False
+        for key in missing:
+            self._render(key)
+
+        painter = QPainter(self.view.viewport())
+        painter.setClipRect(exposed)
+        for key in keys:
+            self._tiles.move_to_end(key)
+            painter.drawPixmap(key[1] * size + dx, key[2] * size + dy, self._tiles[key])
+        painter.end()
+        return True
+
+    # renders tiles covering given scene rect in background, few tiles per event loop pass
+    def prefetch(self, rect):
+        level = self._level()
+        if level is None:
+            return
+        self._schedule(key for key in self._keysIn(level[0], rect) if key not in self._tiles)
+
+    def _schedule(self, keys):
+        pending = set(self._pending)
+        self._pending.extend(key for key in keys if key not in pending)
+        if self._pending and not self._prefetch_timer.isActive():
+            self._prefetch_timer.start(0)
+
+    def _prefetchStep(self):
+        level = self._level()
+        # tiles of other zoom levels aren't needed anymore
+        self._pending = [key for key in self._pending if level is not None and key[0] == level[0]]
+        for key in self._pending[:2]:
+            if key not in self._tiles:
+                self._render(key)
+        del self._pending[:2]
+        if self._pending:
+            self._prefetch_timer.start(0)
+
+    def invalidate(self, rects):
+        if not self._tiles:
+            return
+        for rect in rects:
+            for key in tuple(self._tiles):
+                if self._tileRect(*key).intersects(rect):
+                    del self._tiles[key]
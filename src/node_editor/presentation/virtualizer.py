@@ -0,0 +1,93 @@
+# materializes node widgets only for nodes inside (or near) visible scene rect,
+# widgets of nodes leaving it are recycled through pool
+class NodeVirtualizer:
+
+    def __init__(self, grScene, margin=256, pool_limit=256):
+        self.grScene = grScene
+        self.margin = margin
+        self.pool_limit = pool_limit
+
+        self._rect = None
+        self._suspended = False
+        self._pool = []
+        self._materialized = {}
+        for node in grScene.scene.nodes:
+            if node.grNode is not None:
+                self._materialized[node] = None
+
+    def __len__(self):
+        return len(self._materialized)
+
+    def setVisibleRect(self, rect):
+        self._rect = (
+            rect.left() - self.margin,
+            rect.top() - self.margin,
+            rect.right() + self.margin,
+            rect.bottom() + self.margin,
+        )
+        self._update()
+
+    def _update(self):
+        if self._suspended:
+            return
+        geometry = self.grScene.scene.geometry
+        visible = geometry.getItems(geometry.query(*self._rect))
+        visible_set = set(visible)
+        for node in tuple(self._materialized):
+            if node not in visible_set:
+                self.release(node)
+        for node in visible:
+            if node.grNode is None:
+                self.materialize(node)
+
+    # suspended virtualizer releases its widgets and materializes nothing until resumed,
+    # visible rect is still tracked
+    def setSuspended(self, suspended):
+        if suspended == self._suspended:
+            return
+        self._suspended = suspended
+        if suspended:
+            for node in tuple(self._materialized):
+                self.release(node)
+        elif self._rect is not None:
+            self._update()
+
+    # re-evaluates visibility of nodes, which were added or moved by model
+    def refresh(self, nodes):
+        if self._rect is None or self._suspended:
+            return
+        left, top, right, bottom = self._rect
+        for node in nodes:
+            x, y = node.pos
+            inside = x <= right and y <= bottom and x + node.width >= left and y + node.height >= top
+            if inside and node.grNode is None:
+                self.materialize(node)
+            elif not inside and node.grNode is not None:
+                self.release(node)
+
+    def materialize(self, node):
+        if self._pool:
+            grNode = self._pool.pop()
+            grNode.bind(node)
+            grNode.setDetailLevel(self.grScene.detail_level)
+        else:
+            self.grScene.createNodeWidget(node)
+        self._materialized[node] = None
+
+    def release(self, node, force=False):
+        # selected nodes stay alive, so selection and dragging outside of view keep working
+        if not force and node in node.scene.selection.nodes:
+            return
+        self._materialized.pop(node, None)
+        if len(self._pool) < self.pool_limit:
+            grNode = node.grNode
+            grNode.unbind()
+            self._pool.append(grNode)
+        else:
+            self.grScene.destroyNodeWidget(node)
+
+    def clear(self):
+        for grNode in self._pool:
+            self.grScene.removeItem(grNode)
+        self._pool.clear()
+        self._materialized.clear()